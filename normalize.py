@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Wspólna normalizacja map diagnostycznych do uint8 dla skryptów wizualizacji.
+
+- percentiles: kilka percentyli naraz w jednym przejściu - dla obrazów
+  całkowitych (uint8/uint16) z histogramu (np.bincount), dla pozostałych
+  jednym np.partition względem wszystkich potrzebnych pozycji (bez
+  sortowania i bez osobnej kopii na każdy percentyl); interpolacja liniowa
+  jak w np.percentile. Opcjonalnie (bins) z drobnego histogramu między
+  minimum a maksimum - przybliżenie z błędem najwyżej szerokości kubełka,
+- to_uint8: (arr - lo) / (hi - lo) * 255 obcięte do 0..255 funkcjami
+  ufunc w miejscu, do podanego bufora uint8 (out) z pomocniczym buforem
+  zmiennoprzecinkowym (scratch), więc seria map tego samego rozmiaru nie
+  alokuje nowych tablic.
+"""
+
+import numpy as np
+
+
+def _lerp(a, b, t):
+    # Jak w np.percentile: wynik dokładny na obu końcach przedziału
+    diff = b - a
+    return b - diff * (1 - t) if t >= 0.5 else a + diff * t
+
+
+def _positions(n, qs):
+    """Pozycje (dolna, górna, waga) w porządku rosnącym dla percentyli qs."""
+    out = []
+    for q in qs:
+        virtual = (n - 1) * (q / 100.0)
+        lower = int(np.floor(virtual))
+        out.append((lower, min(lower + 1, n - 1), virtual - lower))
+    return out
+
+
+def percentiles(arr, qs, bins=None):
+    """
+    Percentyle qs (0-100, liczba albo sekwencja) tablicy arr jako float
+    (lub lista floatów). bins - liczba kubełków histogramu dla tablic
+    zmiennoprzecinkowych (przybliżenie zamiast dokładnego np.partition).
+    """
+    single = np.ndim(qs) == 0
+    qs = [float(q) for q in np.atleast_1d(qs)]
+    if any(q < 0 or q > 100 for q in qs):
+        raise ValueError(f'Percentyle muszą być w zakresie 0-100: {qs}')
+    flat = np.asarray(arr).ravel()
+    positions = _positions(flat.size, qs)
+    if flat.dtype in (np.uint8, np.uint16):
+        cdf = np.cumsum(np.bincount(flat))
+        value = lambda k: float(np.searchsorted(cdf, k, side='right'))
+    elif bins:
+        lo, hi = float(flat.min()), float(flat.max())
+        width = (hi - lo) / bins or 1.0
+        index = np.minimum(((flat - lo) / width).astype(np.intp), bins - 1)
+        cdf = np.cumsum(np.bincount(index, minlength=bins))
+        # Środek kubełka zawierającego k-tą wartość
+        value = lambda k: lo + (float(np.searchsorted(cdf, k, side='right')) + 0.5) * width
+    else:
+        kth = sorted(set(k for lower, upper, _ in positions for k in (lower, upper)))
+        part = np.partition(flat, kth)
+        value = lambda k: float(part[k])
+    result = [_lerp(value(lower), value(upper), t) for lower, upper, t in positions]
+    return result[0] if single else result
+
+
+def to_uint8(arr, lo, hi, out=None, scratch=None):
+    """
+    Mapuj arr liniowo z [lo, hi] na 0..255 (poza zakresem obcięte, ułamki
+    obcięte jak astype(np.uint8)) do bufora out. scratch - bufor o kształcie
+    arr na obliczenia pośrednie (float32, a dla float64 float64); może to być
+    samo arr, jeśli jest zmiennoprzecinkowe i nie jest już potrzebne.
+    """
+    arr = np.asarray(arr)
+    if out is None:
+        out = np.empty(arr.shape, dtype=np.uint8)
+    if scratch is None:
+        scratch = np.empty(arr.shape, dtype=np.result_type(arr.dtype, np.float32))
+    np.subtract(arr, lo, out=scratch, casting='unsafe')
+    np.divide(scratch, max(hi - lo, 1e-6), out=scratch)
+    np.multiply(scratch, 255.0, out=scratch)
+    np.clip(scratch, 0.0, 255.0, out=scratch)
+    np.copyto(out, scratch, casting='unsafe')
+    return out
+
+
+def normalize_percentiles(arr, low=1.0, high=99.0, out=None, scratch=None):
+    """Skrót: to_uint8 między percentylami low i high tablicy arr."""
+    lo, hi = percentiles(arr, (low, high))
+    return to_uint8(arr, lo, hi, out, scratch)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Wspólny dostęp do pikseli bez zbędnych kopii dla skryptów NumPy (zestawy 1-4).
+
+- argb_view: bufor spakowanych pikseli 32-bit 0xAARRGGBB (int[] z
+  ColorProcessor ImageJ, surowy zrzut, tablica uint32) oglądany jako
+  (H, W, 4) uint8 bez kopiowania; zapis przez widok zmienia bufor,
+- rgb_view / channel: kanały R, G, B jako widoki (wycinki z krokiem),
+  zamiast przesunięć i masek (rgb >> 16) & 0xff dla każdego piksela,
+- load_image: obraz PIL -> NumPy jednym kopiowaniem: bez convert()
+  do trybu, który obraz już ma, i bez drugiej kopii z np.array;
+  dla uint8 wynik jest tylko do odczytu (jak np.asarray),
+- image_view: tablica uint8 (H, W) lub (H, W, 4) jako obraz PIL
+  współdzielący z nią pamięć.
+
+Kolejność bajtów w pamięci zależy od architektury: na little-endian
+piksel 0xAARRGGBB to bajty B, G, R, A.
+"""
+
+import sys
+import numpy as np
+
+if sys.byteorder == 'little':
+    B, G, R, A = 0, 1, 2, 3
+    _RGB = slice(2, None, -1)
+else:
+    A, R, G, B = 0, 1, 2, 3
+    _RGB = slice(1, 4)
+
+CHANNELS = {'r': R, 'g': G, 'b': B, 'a': A}
+
+
+def argb_view(packed, shape=None):
+    """
+    Spakowane piksele ARGB (tablica 32-bitowa albo obiekt z protokołem bufora,
+    np. array('i'), bytearray) jako widok (H, W, 4) uint8.
+    shape – (H, W), gdy bufor jest płaski.
+    """
+    if not isinstance(packed, np.ndarray):
+        packed = np.frombuffer(packed, dtype=np.uint32)
+    if packed.dtype.itemsize != 4:
+        raise TypeError(f'Oczekiwano pikseli 32-bitowych, otrzymano {packed.dtype}')
+    if shape is not None:
+        packed = packed.reshape(shape)
+    return packed.view(np.uint8).reshape(packed.shape + (4,))
+
+
+def rgb_view(argb):
+    """Kanały R, G, B widoku (H, W, 4) w tej kolejności, bez kopiowania."""
+    return argb[..., _RGB]
+
+
+def channel(argb, name):
+    """Jeden kanał ('r', 'g', 'b' lub 'a') widoku (H, W, 4), bez kopiowania."""
+    return argb[..., CHANNELS[name]]
+
+
+def pack_argb(rgb, alpha=255, out=None):
+    """
+    Obraz RGB (H, W, 3) -> spakowane piksele ARGB (H, W) uint32.
+    out – istniejący bufor 32-bitowy (np. piksele ColorProcessor), zapisywany przez widok.
+    """
+    rgb = np.asarray(rgb)
+    if out is None:
+        out = np.empty(rgb.shape[:2], dtype=np.uint32)
+    view = argb_view(out, rgb.shape[:2])
+    view[..., A] = alpha
+    rgb_view(view)[...] = rgb
+    return out
+
+
+def load_image(path, mode='L', dtype=None):
+    """
+    Wczytaj obraz jako tablicę NumPy w trybie PIL mode ('L', 'RGB', 'RGBA', ...).
+    dtype – typ wyniku (np. np.float32); rzutowanie tworzy nową, zapisywalną tablicę.
+    """
+    from PIL import Image
+    img = Image.open(path)
+    if img.mode != mode:
+        img = img.convert(mode)
+    return np.asarray(img, dtype=dtype)
+
+
+def image_view(arr):
+    """
+    Tablica uint8 (H, W) albo (H, W, 4) jako obraz PIL ('L' / 'RGBA')
+    współdzielący pamięć z tablicą; inne tablice przez Image.fromarray (kopia).
+    """
+    from PIL import Image
+    arr = np.asarray(arr)
+    if arr.dtype == np.uint8 and arr.flags.c_contiguous:
+        if arr.ndim == 2:
+            mode = 'L'
+        elif arr.ndim == 3 and arr.shape[2] == 4:
+            mode = 'RGBA'
+        else:
+            mode = None
+        if mode is not None:
+            size = (arr.shape[1], arr.shape[0])
+            return Image.frombuffer(mode, size, arr, 'raw', mode, 0, 1)
+    return Image.fromarray(arr)
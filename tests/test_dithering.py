@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'zestaw1'))
+from dithering import diffuse_rows
+
+
+def _image(width, height, seed=0):
+    rng = random.Random(seed)
+    return [[rng.randint(0, 255) for _ in range(width)] for _ in range(height)]
+
+
+def _threshold(v):
+    return 255 if v >= 128 else 0
+
+
+def test_wavefront_rows_can_be_kept():
+    rows = _image(150, 90)
+    for kernel in ('floyd-steinberg', 'jarvis-judice-ninke', 'atkinson'):
+        sequential = list(diffuse_rows(rows, 150, _threshold, kernel))
+        for workers in (2, 3):
+            wavefront = list(diffuse_rows(rows, 150, _threshold, kernel, workers=workers))
+            assert [list(r) for r in wavefront] == [list(r) for r in sequential], (kernel, workers)
+
+
+def test_wavefront_rows_are_distinct_objects():
+    rows = _image(40, 30, seed=1)
+    out = list(diffuse_rows(rows, 40, _threshold, workers=2))
+    assert len(set(id(r) for r in out)) == len(out)
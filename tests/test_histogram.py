@@ -0,0 +1,21 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'zestaw3'))
+from histogram import compute_histogram, cumulative_histogram
+
+
+def test_histogram_follows_in_place_changes():
+    img = np.random.default_rng(0).integers(0, 256, (40, 30), dtype=np.uint8)
+    first = compute_histogram(img)
+    img[0, 0] = 255 - img[0, 0] if img[0, 0] != 127 else 0
+    np.testing.assert_array_equal(compute_histogram(img), np.bincount(img.ravel(), minlength=256))
+    assert not np.array_equal(compute_histogram(img), first)
+    np.testing.assert_array_equal(cumulative_histogram(img), np.cumsum(compute_histogram(img)))
+
+
+def test_chunked_histogram_matches_whole():
+    img = np.random.default_rng(1).integers(0, 65536, (37, 11), dtype=np.uint16)
+    np.testing.assert_array_equal(compute_histogram(img, chunk_rows=5), compute_histogram(img))
@@ -0,0 +1,83 @@
+import json
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'zestaw2', 'zad4'))
+import mse
+from mse import SSIM_C1, SSIM_C2, SSIM_SIGMA, SSIM_WINDOW, QualityStats, compare_sources, write_report
+from stream_resample import ArrayRows
+
+
+def _pair(shape, seed=0):
+    rng = np.random.default_rng(seed)
+    ref = rng.integers(0, 256, shape, dtype=np.uint8)
+    # Kopia z szumem i przesunięciem jasności (SSIM wyraźnie poniżej 1)
+    noise = rng.normal(0, 20, shape) + 10
+    test = np.clip(ref + noise, 0, 255).astype(np.uint8)
+    return ref, test
+
+
+def _ssim_reference(ref, test):
+    """SSIM całego obrazu w float64: okno Gaussa 11×11 jako pętla po przesunięciach."""
+    d = np.arange(SSIM_WINDOW) - (SSIM_WINDOW - 1) / 2.0
+    g = np.exp(-d * d / (2.0 * SSIM_SIGMA ** 2))
+    window = np.outer(g, g) / np.outer(g, g).sum()
+    x, y = ref.astype(np.float64), test.astype(np.float64)
+    h = x.shape[0] - SSIM_WINDOW + 1
+    w = x.shape[1] - SSIM_WINDOW + 1
+
+    def blur(a):
+        out = np.zeros((h, w) + a.shape[2:])
+        for i in range(SSIM_WINDOW):
+            for j in range(SSIM_WINDOW):
+                out += window[i, j] * a[i:i + h, j:j + w]
+        return out
+    mx, my = blur(x), blur(y)
+    vx, vy, cxy = blur(x * x) - mx * mx, blur(y * y) - my * my, blur(x * y) - mx * my
+    ssim = ((2 * mx * my + SSIM_C1) * (2 * cxy + SSIM_C2) /
+            ((mx * mx + my * my + SSIM_C1) * (vx + vy + SSIM_C2)))
+    return float(np.mean(ssim.mean(axis=(0, 1))))
+
+
+def _metrics(ref, test, chunk_rows, **metrics):
+    stats = compare_sources(ArrayRows(ref), ArrayRows(test), chunk_rows, **metrics)
+    return stats.ssim(), stats.ms_ssim()
+
+
+@pytest.mark.parametrize('use_scipy', [True, False])
+def test_ssim_matches_float64_reference(monkeypatch, use_scipy):
+    if not use_scipy:
+        # Filtr na wycinkach NumPy zamiast scipy.ndimage
+        monkeypatch.setattr(mse, '_correlate1d', False)
+    ref, test = _pair((40, 53, 3))
+    ssim, _ = _metrics(ref, test, 256, ssim=True)
+    assert ssim == pytest.approx(_ssim_reference(ref, test), abs=1e-5)
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 4, 10, 11, 37])
+def test_ssim_and_ms_ssim_do_not_depend_on_chunk_rows(chunk_rows):
+    ref, test = _pair((181, 190, 3), seed=1)
+    whole_ssim, whole_ms = _metrics(ref, test, 1000, ms_ssim=True)
+    ssim, ms = _metrics(ref, test, chunk_rows, ms_ssim=True)
+    assert not math.isnan(whole_ms)
+    assert ssim == pytest.approx(whole_ssim, rel=1e-6)
+    assert ms == pytest.approx(whole_ms, rel=1e-6)
+
+
+def test_json_report_writes_non_finite_values_as_null(tmp_path):
+    ref, _ = _pair((8, 9, 3))
+    stats = QualityStats(ssim=True)
+    stats.update(ref, ref)
+    # Obrazy identyczne (PSNR = inf) i mniejsze od okna SSIM (nan)
+    assert math.isinf(stats.psnr()) and math.isnan(stats.ssim())
+    row = {'candidate': 'a.png', 'psnr': stats.psnr(), 'ssim': stats.ssim(), 'mse_avg': 0.0, 'error': ''}
+    path = str(tmp_path / 'report.json')
+    write_report([row], path, 'ref.png')
+    with open(path) as f:
+        result = json.load(f)['results'][0]
+    assert result['psnr'] is None and result['ssim'] is None
+    assert result['mse_avg'] == 0.0
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'zestaw1'))
+import ordered
+from ordered import MATRIX_3X3, bayer_matrix, level_table
+
+
+@pytest.mark.parametrize('levels', [[0, 255], [0, 64, 128, 192, 255], [0, 10, 20, 200, 250, 255]])
+@pytest.mark.parametrize('matrix', [MATRIX_3X3, bayer_matrix(8),
+                                    np.random.default_rng(5).permutation(32 * 32).reshape(32, 32)])
+def test_numpy_level_table_matches_loop(matrix, levels):
+    ordered._level_tables.clear()
+    expected = level_table(np.asarray(matrix).tolist(), levels)
+    ordered._level_tables.clear()
+    assert level_table(np.asarray(matrix), levels) == expected
@@ -0,0 +1,70 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'zestaw3', 'zad4'))
+from otsu import otsu_local, otsu_local_parallel, otsu_multiclass_thresholds
+
+
+@pytest.mark.parametrize('window_size', [3, 5, 11])
+def test_local_otsu_modes_are_identical(window_size):
+    rng = np.random.default_rng(window_size)
+    # Szum z niewielką liczbą poziomów: dużo remisów i pustych kubełków
+    gray = (rng.integers(0, 6, (23, 31)) * 40 + rng.integers(0, 3, (23, 31))).astype(np.uint8)
+    naive = otsu_local(gray, window_size, mode='naive')
+    np.testing.assert_array_equal(otsu_local(gray, window_size), naive)
+    np.testing.assert_array_equal(otsu_local_parallel(gray, window_size, workers=3), naive)
+
+
+def _class_terms(hist):
+    """S²/W każdego przedziału kubełków [a, b) (0 dla pustych), z sum skumulowanych."""
+    count = np.concatenate(([0], np.cumsum(hist)))
+    total = np.concatenate(([0], np.cumsum(hist * np.arange(256))))
+    d_count = (count[None, :] - count[:, None]).astype(np.float64)
+    d_sum = (total[None, :] - total[:, None]).astype(np.float64)
+    terms = np.zeros_like(d_count)
+    np.divide(d_sum ** 2, d_count, out=terms, where=d_count > 0)
+    return terms
+
+
+def _multiclass_score(hist, thresholds):
+    """Suma S²/W po klasach (równoważna wariancji międzyklasowej)."""
+    terms = _class_terms(hist)
+    edges = [0] + list(thresholds) + [256]
+    return sum(terms[a, b] for a, b in zip(edges[:-1], edges[1:]))
+
+
+def _brute_force_three_class(hist):
+    """Wszystkie pary 0 < T1 < T2 < 256; przy remisie najmniejsze T2, potem T1."""
+    terms = _class_terms(hist)
+    t1, t2 = np.meshgrid(np.arange(256), np.arange(256), indexing='ij')
+    scores = np.where(t1 < t2, terms[0, t1] + terms[t1, t2] + terms[t2, 256], -np.inf)
+    scores[0] = -np.inf
+    best = scores.max()
+    pairs = np.argwhere(scores == best)
+    t1_best, t2_best = min(pairs, key=lambda p: (p[1], p[0]))
+    return [int(t1_best), int(t2_best)]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_three_class_otsu_matches_exhaustive_search(seed):
+    rng = np.random.default_rng(seed)
+    # Histogram z przerwami i kilkoma skupieniami
+    hist = rng.integers(0, 50, 256) * (rng.random(256) < 0.6)
+    hist[rng.integers(0, 256, 3)] += 500
+    assert otsu_multiclass_thresholds(hist, 3) == _brute_force_three_class(hist)
+
+
+def test_three_class_otsu_degenerate_histograms():
+    # Jeden niepusty kubełek: każdy podział ma ten sam wynik, wybierane są najmniejsze progi
+    hist = np.zeros(256, dtype=np.int64)
+    hist[100] = 1000
+    assert otsu_multiclass_thresholds(hist, 3) == [1, 2]
+    # Dwa niepuste kubełki: progi muszą je rozdzielić
+    hist[200] = 10
+    t1, t2 = otsu_multiclass_thresholds(hist, 3)
+    assert 0 < t1 < t2 < 256
+    assert 100 < t1 <= 200 or 100 < t2 <= 200
+    assert _multiclass_score(hist, (t1, t2)) == _multiclass_score(hist, _brute_force_three_class(hist))
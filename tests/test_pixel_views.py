@@ -0,0 +1,61 @@
+import importlib
+import os
+import sys
+from array import array
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import pixel_views
+
+
+@pytest.fixture(params=['little', 'big'])
+def layout(request, monkeypatch):
+    """Moduł z układem kanałów dla danej kolejności bajtów i typ uint32 w tej kolejności."""
+    monkeypatch.setattr(sys, 'byteorder', request.param)
+    module = importlib.reload(pixel_views)
+    yield module, np.dtype('<u4' if request.param == 'little' else '>u4')
+    monkeypatch.undo()
+    importlib.reload(pixel_views)
+
+
+def _packed(dtype):
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 2 ** 32, (5, 7), dtype=np.uint64).astype(dtype)
+
+
+def test_channels_match_shifts_and_masks(layout):
+    pv, dtype = layout
+    packed = _packed(dtype)
+    view = pv.argb_view(packed)
+    for name, shift in (('a', 24), ('r', 16), ('g', 8), ('b', 0)):
+        np.testing.assert_array_equal(pv.channel(view, name), (packed >> shift) & 0xff)
+    rgb = pv.rgb_view(view)
+    np.testing.assert_array_equal(rgb, np.stack([(packed >> s) & 0xff for s in (16, 8, 0)], axis=-1))
+
+
+def test_writes_through_view_change_the_buffer(layout):
+    pv, dtype = layout
+    packed = _packed(dtype)
+    view = pv.argb_view(packed)
+    assert np.shares_memory(view, packed)
+    pv.channel(view, 'g')[...] = 0x5a
+    np.testing.assert_array_equal((packed >> 8) & 0xff, 0x5a)
+    rgb = np.random.default_rng(1).integers(0, 256, (5, 7, 3), dtype=np.uint8)
+    out = pv.pack_argb(rgb, alpha=0x80, out=packed)
+    assert out is packed
+    expected = (0x80 << 24) | (rgb[..., 0].astype(np.uint32) << 16) | (rgb[..., 1].astype(np.uint32) << 8) | rgb[..., 2]
+    np.testing.assert_array_equal(packed, expected)
+
+
+def test_flat_int_array_round_trip():
+    # int[] z ColorProcessor jako array('i'): widok na bufor, zapis zmienia array
+    rgb = np.random.default_rng(2).integers(0, 256, (3, 4, 3), dtype=np.uint8)
+    pixels = array('i', [0] * 12)
+    view = pixel_views.argb_view(pixels, (3, 4))
+    pixel_views.rgb_view(view)[...] = rgb
+    pixel_views.channel(view, 'a')[...] = 255
+    values = [p & 0xffffffff for p in pixels]
+    assert values == [0xff000000 | (int(r) << 16) | (int(g) << 8) | int(b)
+                      for r, g, b in rgb.reshape(-1, 3)]
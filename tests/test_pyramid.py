@@ -0,0 +1,28 @@
+import os
+import sys
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'zestaw2', 'zad1'))
+sys.path.insert(0, os.path.join(HERE, '..', 'zestaw1'))
+from pyramid import build_pyramid, filter_weights
+from resample import KERNELS
+
+
+def test_lanczos_has_full_support_for_decimation():
+    # Lanczos-3 rozciągnięty dwukrotnie: wszystkie płaty do ±6 pikseli wejścia
+    kernel, radius = KERNELS['lanczos']
+    d, w = filter_weights('lanczos')
+    assert d.max() < 2 * radius < d.max() + 1
+    expected = kernel(d / 2.0)
+    np.testing.assert_allclose(w, expected / expected.sum())
+
+
+def test_strips_do_not_change_levels():
+    img = np.random.default_rng(0).integers(0, 256, (101, 77), dtype=np.uint8)
+    for name in ('box', 'gaussian', 'lanczos'):
+        whole = build_pyramid(img, name, strip_rows=1000)
+        strips = build_pyramid(img, name, strip_rows=7)
+        for a, b in zip(whole.levels[1:], strips.levels[1:]):
+            np.testing.assert_array_equal(a, b)
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'zestaw1'))
+from resample import plan_for, resample
+
+PIL_FILTERS = {
+    'bilinear': Image.BILINEAR,
+    'bicubic': Image.BICUBIC,
+    'lanczos': Image.LANCZOS,
+}
+
+SIZES = [(200, 150), (13, 17), (53, 80), (101, 33), (64, 70)]
+
+
+@pytest.mark.parametrize('method', sorted(PIL_FILTERS))
+@pytest.mark.parametrize('shape', [(37, 53), (48, 64, 3)])
+def test_separable_matches_pil(method, shape):
+    # Wagi stałoprzecinkowe i kolejność osi jak w PIL: wynik identyczny (tolerancja 0)
+    img = np.random.default_rng(17).integers(0, 256, shape, dtype=np.uint8)
+    for new_w, new_h in SIZES:
+        expected = np.asarray(Image.fromarray(img).resize((new_w, new_h), PIL_FILTERS[method]))
+        np.testing.assert_array_equal(resample(img, new_w, new_h, method), expected)
+
+
+@pytest.mark.parametrize('method', sorted(PIL_FILTERS) + ['two-nearest', 'min-max'])
+def test_strips_match_whole_image(method):
+    img = np.random.default_rng(3).integers(0, 256, (41, 29, 3), dtype=np.uint8)
+    plan = plan_for(29, 41, 47, 23, method)
+    whole = plan.apply(img)
+    strips = []
+    for y_start in range(0, 23, 5):
+        y_stop = min(23, y_start + 5)
+        lo, hi = plan.source_rows(y_start, y_stop)
+        strips.append(plan.apply_strip(img[lo:hi], lo, y_start, y_stop))
+    np.testing.assert_array_equal(np.concatenate(strips), whole)
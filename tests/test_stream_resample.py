@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import os
+import struct
+import sys
+import zlib
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'zestaw1'))
+from stream_resample import PNG_BATCH_ROWS, PNG_SIGNATURE, PngRows, resample_file
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+    return np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+
+
+def _filter_line(kind, line, prev, bpp):
+    """Filtr PNG typu kind dla jednego wiersza (int16) - odwrotność dekodera."""
+    left = np.concatenate([np.zeros(bpp, np.int16), line[:-bpp]])
+    up_left = np.concatenate([np.zeros(bpp, np.int16), prev[:-bpp]])
+    predictor = [0, left, prev, (left + prev) // 2, _paeth(left, prev, up_left)][kind]
+    return ((line - predictor) & 0xff).astype(np.uint8)
+
+
+def _write_png(path, img, chunk_size=997):
+    """PNG, w którym wiersz y używa filtra y % 5 (None, Sub, Up, Average, Paeth)."""
+    h, w = img.shape[:2]
+    bpp = 1 if img.ndim == 2 else img.shape[2]
+    color = {1: 0, 2: 4, 3: 2, 4: 6}[bpp]
+    lines = img.reshape(h, w * bpp).astype(np.int16)
+    prev = np.zeros(w * bpp, np.int16)
+    raw = b''
+    for y in range(h):
+        kind = y % 5
+        raw += bytes([kind]) + _filter_line(kind, lines[y], prev, bpp).tobytes()
+        prev = lines[y]
+    data = zlib.compress(raw)
+
+    def chunk(kind, payload):
+        return (struct.pack('>I', len(payload)) + kind + payload
+                + struct.pack('>I', zlib.crc32(kind + payload) & 0xffffffff))
+    with open(path, 'wb') as f:
+        f.write(PNG_SIGNATURE)
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', w, h, 8, color, 0, 0, 0)))
+        for i in range(0, len(data), chunk_size):
+            f.write(chunk(b'IDAT', data[i:i + chunk_size]))
+        f.write(chunk(b'IEND', b''))
+
+
+@pytest.mark.parametrize('channels', [1, 2, 3, 4])
+def test_png_rows_round_trip_all_filters(tmp_path, channels):
+    rng = np.random.default_rng(channels)
+    shape = (PNG_BATCH_ROWS + 45, 37) + (() if channels == 1 else (channels,))
+    img = rng.integers(0, 256, shape, dtype=np.uint8)
+    path = str(tmp_path / 'filters.png')
+    _write_png(path, img)
+    # Zgodność z niezależnym dekoderem i z danymi źródłowymi
+    assert np.array_equal(np.asarray(Image.open(path)), img)
+
+    with PngRows(path) as source:
+        assert source.shape == img.shape
+        got = np.concatenate([source.rows(lo, min(lo + 19, shape[0])) for lo in range(0, shape[0], 19)])
+    assert np.array_equal(got, img)
+    assert source.file.closed
+
+
+def test_png_rows_closes_file_when_not_fully_read(tmp_path):
+    path = str(tmp_path / 'partial.png')
+    _write_png(path, np.zeros((PNG_BATCH_ROWS + 10, 8), dtype=np.uint8))
+    with PngRows(path) as source:
+        source.rows(0, 3)
+    assert source.file.closed
+    # Zamknięcie przed pierwszym odczytem
+    with PngRows(path) as source:
+        pass
+    assert source.file.closed
+
+
+def test_png_rows_closes_file_on_decode_error(tmp_path):
+    path = str(tmp_path / 'truncated.png')
+    _write_png(path, np.zeros((40, 8), dtype=np.uint8))
+    with open(path, 'rb') as f:
+        data = f.read()
+    # Bez IDAT z danymi i IEND: dekodowanie kończy się błędem
+    with open(path, 'wb') as f:
+        f.write(data[:33])
+    source = PngRows(path)
+    with pytest.raises(ValueError):
+        source.rows(0, 40)
+    assert source.file.closed
+
+
+def test_resample_png_with_all_filters_matches_array(tmp_path):
+    rng = np.random.default_rng(7)
+    img = rng.integers(0, 256, (120, 90, 3), dtype=np.uint8)
+    src = str(tmp_path / 'src.png')
+    _write_png(src, img)
+    np.save(str(tmp_path / 'src.npy'), img)
+    resample_file(src, str(tmp_path / 'a.npy'), 45, 60, 'bilinear', strip_rows=16)
+    resample_file(str(tmp_path / 'src.npy'), str(tmp_path / 'b.npy'), 45, 60, 'bilinear', strip_rows=16)
+    assert np.array_equal(np.load(str(tmp_path / 'a.npy')), np.load(str(tmp_path / 'b.npy')))
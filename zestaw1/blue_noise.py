@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+Mapy progów "blue noise" metodą void-and-cluster (Ulichney, 1993).
+
+Mapa size×size zawiera rangi 0..size²-1 i podstawia się ją w miejsce
+macierzy Bayera w ordered.py (dither_1bit_rows, dither_levels_rows, ...).
+Daje jakość zbliżoną do dyfuzji błędu przy szybkości ordered ditheringu.
+
+Generowanie (NumPy) jest kosztowne, więc gotowe mapy trafiają do pamięci
+podręcznej na dysku. Nazwa pliku to skrót SHA-1 parametrów generatora
+(rozmiar, sigma, ziarno, gęstość, wersja algorytmu), a plik zawiera same
+rangi jako uint16 little-endian, bez nagłówka. Ponowne użycie to tylko
+odwzorowanie pliku w pamięci:
+- CPython: np.memmap,
+- Jython 2.7 (ImageJ/Fiji, bez NumPy): java.nio MappedByteBuffer;
+  w Jythonie mapy są tylko wczytywane - wygenerować je trzeba wcześniej
+  w CPythonie (python blue_noise.py 64 128 ...).
+
+Użycie:
+    from blue_noise import blue_noise_matrix
+    from ordered import dither_levels_rows
+    rows = dither_levels_rows(src_rows, width, blue_noise_matrix(64), levels)
+"""
+import hashlib
+import os
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Zmiana algorytmu musi zmienić adres w pamięci podręcznej
+ALGORITHM_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'obrazy-repo', 'blue-noise')
+
+
+def cache_key(size, sigma=1.5, seed=0, density=0.1):
+    """Adres mapy w pamięci podręcznej: SHA-1 parametrów, które ją wyznaczają."""
+    params = "void-and-cluster v%d size=%d sigma=%r seed=%d density=%r" % (
+        ALGORITHM_VERSION, size, float(sigma), seed, float(density))
+    return hashlib.sha1(params.encode('ascii')).hexdigest()
+
+
+def cache_path(size, sigma=1.5, seed=0, density=0.1, cache_dir=None):
+    """Ścieżka pliku z mapą o danych parametrach."""
+    if cache_dir is None:
+        cache_dir = DEFAULT_CACHE_DIR
+    return os.path.join(cache_dir, "%s.u16" % cache_key(size, sigma, seed, density))
+
+
+def blue_noise_map(size=64, sigma=1.5, seed=0, density=0.1, cache_dir=None):
+    """
+    Mapa rang size×size z pamięci podręcznej (wygenerowana przy pierwszym użyciu).
+    Zwraca tablicę odwzorowaną w pamięci: np.memmap (CPython)
+    albo ShortBuffer z java.nio (Jython; ranks[y*size + x]).
+    """
+    if size < 2 or size > 256:
+        raise ValueError("Blue-noise map size must be in 2..256: %d" % size)
+    path = cache_path(size, sigma, seed, density, cache_dir)
+    if not _valid(path, size):
+        if np is None:
+            raise ImportError("Generating blue-noise maps requires NumPy; run "
+                              "'python blue_noise.py %d' under CPython first" % size)
+        _store(path, void_and_cluster(size, sigma, seed, density))
+    return _map(path, size)
+
+
+def blue_noise_matrix(size=64, sigma=1.5, seed=0, density=0.1, cache_dir=None):
+    """
+    Mapa rang do ordered.py: tablica NumPy (size, size) odwzorowana
+    w pamięci (bez wczytywania do list), a bez NumPy lista wierszy
+    (lista list int), tak jak bayer_matrix.
+    """
+    ranks = blue_noise_map(size, sigma, seed, density, cache_dir)
+    if np is not None:
+        return ranks
+    return [[ranks[y * size + x] for x in range(size)] for y in range(size)]
+
+
+def void_and_cluster(size, sigma=1.5, seed=0, density=0.1):
+    """
+    Rangi void-and-cluster dla torusa size×size (NumPy, uint16).
+
+    Energia piksela to suma gaussowskich (sigma) wkładów pikseli ustawionych,
+    liczona okresowo; "klaster" to ustawiony piksel o największej energii,
+    "pustka" - pusty piksel o najmniejszej.
+    1. losowy wzór początkowy (gęstość density) rozpraszany, aż usunięcie
+       klastra i wypełnienie pustki trafi w to samo miejsce,
+    2. rangi wzoru początkowego: kolejne usuwanie klastrów (rangi malejąco),
+    3. rangi do połowy: kolejne wypełnianie pustek,
+    4. druga połowa: wypełnianie klastrów pikseli pustych (energia wzoru
+       odwróconego), czyli piksel pusty o największej energii pustych.
+    """
+    if np is None:
+        raise ImportError("void_and_cluster requires NumPy")
+    n = size * size
+    # Jądro gaussowskie na torusie, powielone 2×2: okno [size-y:2size-y, size-x:2size-x]
+    # to jądro przesunięte do (y, x), bez kopiowania
+    d = np.minimum(np.arange(size), size - np.arange(size)).astype(np.float64)
+    g = np.exp(-d * d / (2.0 * sigma * sigma))
+    tiled = np.tile(np.outer(g, g), (2, 2))
+
+    def splat(energy, index, sign):
+        y, x = divmod(int(index), size)
+        energy += sign * tiled[size - y:2 * size - y, size - x:2 * size - x]
+
+    def energy_of(pattern):
+        energy = np.zeros((size, size))
+        for index in np.flatnonzero(pattern):
+            splat(energy, index, 1.0)
+        return energy
+
+    def tightest_cluster(pattern, energy):
+        return int(np.argmax(np.where(pattern, energy, -np.inf)))
+
+    def largest_void(pattern, energy):
+        return int(np.argmin(np.where(pattern, np.inf, energy)))
+
+    rng = np.random.RandomState(seed)
+    initial = rng.random_sample((size, size)) < density
+    if not initial.any():
+        initial.flat[0] = True
+    ones = int(initial.sum())
+
+    # 1. Rozproszenie wzoru początkowego
+    energy = energy_of(initial)
+    while True:
+        cluster = tightest_cluster(initial, energy)
+        initial.flat[cluster] = False
+        splat(energy, cluster, -1.0)
+        void = largest_void(initial, energy)
+        initial.flat[void] = True
+        splat(energy, void, 1.0)
+        if void == cluster:
+            break
+
+    ranks = np.zeros(n, dtype=np.uint16)
+
+    # 2. Rangi ones-1 .. 0
+    pattern = initial.copy()
+    work = energy.copy()
+    for rank in range(ones - 1, -1, -1):
+        cluster = tightest_cluster(pattern, work)
+        pattern.flat[cluster] = False
+        splat(work, cluster, -1.0)
+        ranks[cluster] = rank
+
+    # 3. Rangi ones .. n/2-1
+    pattern = initial
+    for rank in range(ones, n // 2):
+        void = largest_void(pattern, energy)
+        pattern.flat[void] = True
+        splat(energy, void, 1.0)
+        ranks[void] = rank
+
+    # 4. Rangi n/2 .. n-1: energia liczona dla pikseli pustych
+    energy = energy_of(~pattern)
+    for rank in range(max(ones, n // 2), n):
+        cluster = tightest_cluster(~pattern, energy)
+        pattern.flat[cluster] = True
+        splat(energy, cluster, -1.0)
+        ranks[cluster] = rank
+
+    return ranks.reshape(size, size)
+
+
+def _valid(path, size):
+    return os.path.isfile(path) and os.path.getsize(path) == 2 * size * size
+
+
+def _store(path, ranks):
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    # Zapis do pliku tymczasowego i podmiana: równoległy czytelnik nie
+    # zobaczy niepełnego pliku
+    tmp = "%s.%d.tmp" % (path, os.getpid())
+    np.asarray(ranks, dtype='<u2').tofile(tmp)
+    try:
+        os.rename(tmp, path)
+    except OSError:
+        # Windows: plik już istnieje (zapisał go inny proces, treść ta sama)
+        os.remove(tmp)
+
+
+def _map(path, size):
+    if np is not None:
+        return np.memmap(path, dtype='<u2', mode='r', shape=(size, size))
+    if sys.platform.startswith('java'):
+        from java.io import RandomAccessFile
+        from java.nio import ByteOrder
+        from java.nio.channels import FileChannel
+        channel = RandomAccessFile(path, 'r').getChannel()
+        try:
+            mapped = channel.map(FileChannel.MapMode.READ_ONLY, 0, 2 * size * size)
+        finally:
+            channel.close()
+        return _UnsignedShorts(mapped.order(ByteOrder.LITTLE_ENDIAN).asShortBuffer())
+    # CPython bez NumPy: zwykły odczyt
+    ranks = array('H')
+    f = open(path, 'rb')
+    try:
+        ranks.fromfile(f, size * size)
+    finally:
+        f.close()
+    if sys.byteorder != 'little':
+        ranks.byteswap()
+    return ranks
+
+
+class _UnsignedShorts(object):
+    """ShortBuffer z Javy czytany jako uint16 (Java zna tylko short ze znakiem)."""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+
+    def __getitem__(self, index):
+        return self.buffer.get(index) & 0xFFFF
+
+
+def main(argv):
+    if np is None:
+        print("Generating blue-noise maps requires NumPy")
+        return 1
+    sizes = [int(a) for a in argv] or [64]
+    for size in sizes:
+        blue_noise_map(size)
+        print("%dx%d -> %s" % (size, size, cache_path(size)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+Strumieniowa dyfuzja błędu dla skryptów zestawu 1.
+
+Jądra (Floyd-Steinberg, JJN, Stucki, Burkes, rodzina Sierra, Atkinson)
+pochodzą z jednego rejestru i są przeliczane na przesunięcia i wagi
+tylko raz; opcjonalnie skanowanie serpentynowe.
+
+Przy workers > 1 kilka wierszy przetwarzanych jest jednocześnie
+(front falowy): każdy wiersz trzyma się odpowiednio daleko za
+poprzednim, dzięki czemu wynik jest identyczny z wersją sekwencyjną.
+W Jythonie wątki działają naprawdę równolegle; w CPythonie ogranicza
+je GIL.
+
+Kod działa zarówno w Jythonie 2.7 (ImageJ/Fiji), jak i w CPythonie 3,
+bez NumPy. Obraz czytany jest wiersz po wierszu; w pamięci trzymany jest
+tylko pierścień (reach + 1) wierszy roboczych typu array('d'), gdzie
+reach to zasięg jądra w dół. Gotowe wiersze wyjściowe są oddawane od
+razu, więc pamięć zależy od szerokości obrazu, a nie od jego wysokości.
+
+Kolejność operacji zmiennoprzecinkowych jest taka sama jak w pierwotnych
+pętlach na listach list (wartość wejściowa + kolejne przyczynki błędu),
+więc wynik jest identyczny.
+"""
+import threading
+from array import array
+
+# === Rejestr jąder dyfuzji błędu ===
+# nazwa -> (lista (dx, dy, waga), dzielnik); dy >= 0, a dla dy == 0: dx > 0
+KERNELS = {
+    'floyd-steinberg': ([
+        (1, 0, 7),
+        (-1, 1, 3), (0, 1, 5), (1, 1, 1),
+    ], 16.0),
+    'jarvis-judice-ninke': ([
+        (1, 0, 7), (2, 0, 5),
+        (-2, 1, 3), (-1, 1, 5), (0, 1, 7), (1, 1, 5), (2, 1, 3),
+        (-2, 2, 1), (-1, 2, 3), (0, 2, 5), (1, 2, 3), (2, 2, 1),
+    ], 48.0),
+    'stucki': ([
+        (1, 0, 8), (2, 0, 4),
+        (-2, 1, 2), (-1, 1, 4), (0, 1, 8), (1, 1, 4), (2, 1, 2),
+        (-2, 2, 1), (-1, 2, 2), (0, 2, 4), (1, 2, 2), (2, 2, 1),
+    ], 42.0),
+    'burkes': ([
+        (1, 0, 8), (2, 0, 4),
+        (-2, 1, 2), (-1, 1, 4), (0, 1, 8), (1, 1, 4), (2, 1, 2),
+    ], 32.0),
+    'sierra': ([
+        (1, 0, 5), (2, 0, 3),
+        (-2, 1, 2), (-1, 1, 4), (0, 1, 5), (1, 1, 4), (2, 1, 2),
+        (-1, 2, 2), (0, 2, 3), (1, 2, 2),
+    ], 32.0),
+    'sierra-two-row': ([
+        (1, 0, 4), (2, 0, 3),
+        (-2, 1, 1), (-1, 1, 2), (0, 1, 3), (1, 1, 2), (2, 1, 1),
+    ], 16.0),
+    'sierra-lite': ([
+        (1, 0, 2),
+        (-1, 1, 1), (0, 1, 1),
+    ], 4.0),
+    # Atkinson rozprowadza tylko 6/8 błędu
+    'atkinson': ([
+        (1, 0, 1), (2, 0, 1),
+        (-1, 1, 1), (0, 1, 1), (1, 1, 1),
+        (0, 2, 1),
+    ], 8.0),
+}
+
+# (nazwa, odbite) -> (lista (dx, dy, waga/dzielnik), zasięg w dół, zasięg w bok)
+_compiled = {}
+
+
+def register_kernel(name, weights, divisor):
+    """Dodaj (lub zastąp) jądro w rejestrze."""
+    for dx, dy, weight in weights:
+        if dy < 0 or (dy == 0 and dx <= 0):
+            raise ValueError("Kernel may only diffuse forward: (%d, %d)" % (dx, dy))
+    KERNELS[name] = (list(weights), float(divisor))
+    for key in [k for k in _compiled if k[0] == name]:
+        del _compiled[key]
+
+
+def compile_kernel(name, mirrored=False):
+    """
+    Przesunięcia i współczynniki jądra policzone raz (i zapamiętane).
+    mirrored=True odbija jądro w poziomie (wiersze czytane od prawej).
+    """
+    key = (name, mirrored)
+    if key not in _compiled:
+        if name not in KERNELS:
+            raise KeyError("Unknown diffusion kernel: %s (known: %s)"
+                           % (name, ", ".join(sorted(KERNELS))))
+        weights, divisor = KERNELS[name]
+        sign = -1 if mirrored else 1
+        factors = [(sign * dx, dy, float(weight) / divisor) for dx, dy, weight in weights]
+        reach_y = max([dy for dx, dy, f in factors])
+        pad = max([abs(dx) for dx, dy, f in factors])
+        _compiled[key] = (factors, reach_y, pad)
+    return _compiled[key]
+
+
+def diffuse_rows(rows, width, quantize, kernel='floyd-steinberg', serpentine=False, workers=1):
+    """
+    Dyfuzja błędu strumieniowo.
+
+    rows       - iterowalne wiersze wejściowe (sekwencje width wartości 0-255);
+                 wiersz jest kopiowany od razu, więc bufor może być ponownie użyty
+    quantize   - funkcja: wartość robocza -> wartość wyjściowa
+    kernel     - nazwa jądra z rejestru KERNELS
+    serpentine - wiersze nieparzyste przetwarzane od prawej do lewej
+                 z odbitym jądrem
+    workers    - liczba wątków frontu falowego (1 = sekwencyjnie)
+
+    Zwraca generator wierszy wyjściowych (array('i') z wartościami 0-255),
+    oddawanych po kolei.
+    """
+    if workers > 1:
+        if serpentine:
+            raise ValueError("Wavefront diffusion requires a fixed scan direction (serpentine=False)")
+        return _diffuse_wavefront(rows, width, quantize, kernel, workers)
+    return _diffuse_sequential(rows, width, quantize, kernel, serpentine)
+
+
+def _diffuse_sequential(rows, width, quantize, kernel, serpentine):
+    """Jeden wątek: pierścień reach + 1 wierszy roboczych."""
+    forward = compile_kernel(kernel)
+    backward = compile_kernel(kernel, mirrored=True)
+    reach_y, pad = forward[1], forward[2]
+    ring_size = reach_y + 1
+
+    # Wiersze robocze z marginesem pad po obu stronach: zapisy poza obrazem
+    # trafiają w margines i nie wymagają sprawdzania zakresu
+    ring = [array('d', [0.0] * (width + 2 * pad)) for _ in range(ring_size)]
+    rows = iter(rows)
+    left_to_right = range(pad, width + pad)
+    right_to_left = range(width + pad - 1, pad - 1, -1)
+
+    def load(slot):
+        row = next(rows, None)
+        if row is None:
+            return False
+        buf = ring[slot]
+        for x in range(width):
+            buf[x + pad] = float(row[x])
+        return True
+
+    loaded = 0
+    while loaded < ring_size and load(loaded):
+        loaded += 1
+
+    y = 0
+    while y < loaded:
+        slot = y % ring_size
+        current = ring[slot]
+        if serpentine and y % 2 == 1:
+            factors, columns = backward[0], right_to_left
+        else:
+            factors, columns = forward[0], left_to_right
+        targets = [(ring[(y + dy) % ring_size], dx, f) for dx, dy, f in factors]
+        out = array('i', [0] * width)
+
+        for i in columns:
+            old_pixel = current[i]
+            new_pixel = quantize(old_pixel)
+            out[i - pad] = int(max(0, min(255, new_pixel)))
+            error = old_pixel - new_pixel
+            for buf, dx, f in targets:
+                buf[i + dx] += error * f
+
+        # Wiersz y gotowy - jego miejsce w pierścieniu zajmuje następny wiersz
+        # (marginesy nie są nigdy czytane, więc nie trzeba ich zerować)
+        if load(slot):
+            loaded += 1
+        yield out
+        y += 1
+
+
+class _Abort(Exception):
+    """Przerwanie oczekiwania po błędzie w innym wątku lub zamknięciu generatora."""
+
+
+def _diffuse_wavefront(rows, width, quantize, kernel, workers, block=64):
+    """
+    Front falowy: wątek k przetwarza wiersze k, k + workers, ...
+
+    Piksel x wiersza y jest liczony dopiero, gdy wiersz y-1 ukończył
+    kolumny do x + 2*pad włącznie. Wtedy każda komórka dostaje przyczynki
+    błędu w tej samej kolejności co sekwencyjnie (najpierw cały wiersz
+    wyżej, potem bieżący), a dwa wątki nigdy nie piszą do tej samej
+    komórki jednocześnie. Synchronizacja odbywa się co block kolumn.
+    """
+    factors, reach_y, pad = compile_kernel(kernel)
+    lag = 2 * pad
+    ring_size = workers + reach_y
+    ring = [array('d', [0.0] * (width + 2 * pad)) for _ in range(ring_size)]
+    out_ring = [array('i', [0] * width) for _ in range(ring_size)]
+
+    # Postęp wiersza y zapisany jako y * stride + liczba gotowych kolumn:
+    # wartość rośnie monotonicznie także po ponownym użyciu miejsca w pierścieniu
+    stride = width + 1
+    progress = [-1] * ring_size
+    state = {'height': None, 'emitted': 0, 'error': None, 'stop': False}
+    cond = threading.Condition()
+    rows = iter(rows)
+
+    def load(y):
+        # Wywoływane pod blokadą, zawsze w kolejności rosnących y
+        if state['height'] is not None:
+            return
+        row = next(rows, None)
+        if row is None:
+            state['height'] = y
+            return
+        buf = ring[y % ring_size]
+        for x in range(width):
+            buf[x + pad] = float(row[x])
+
+    def wait_for(predicate):
+        while not predicate():
+            if state['error'] is not None or state['stop']:
+                raise _Abort()
+            cond.wait()
+
+    def work(y):
+        while True:
+            with cond:
+                # Wiersz y-1 już wystartował (i wczytał swój wiersz z wyprzedzeniem),
+                # a miejsce na wynik wiersza y zostało zwolnione przez konsumenta
+                wait_for(lambda: y == 0 or progress[(y - 1) % ring_size] >= (y - 1) * stride)
+                wait_for(lambda: state['emitted'] > y - ring_size)
+                # Poprzedni lokator tego miejsca (y - workers) to wiersz tego samego wątku
+                load(y + reach_y)
+                if state['height'] is not None and y >= state['height']:
+                    return
+                progress[y % ring_size] = y * stride
+                cond.notify_all()
+
+            current = ring[y % ring_size]
+            targets = [(ring[(y + dy) % ring_size], dx, f) for dx, dy, f in factors]
+            out = out_ring[y % ring_size]
+            a = 0
+            while a < width:
+                b = min(width, a + block)
+                if y > 0:
+                    need = (y - 1) * stride + min(width, b + lag)
+                    with cond:
+                        wait_for(lambda: progress[(y - 1) % ring_size] >= need)
+                for i in range(a + pad, b + pad):
+                    old_pixel = current[i]
+                    new_pixel = quantize(old_pixel)
+                    out[i - pad] = int(max(0, min(255, new_pixel)))
+                    error = old_pixel - new_pixel
+                    for buf, dx, f in targets:
+                        buf[i + dx] += error * f
+                with cond:
+                    progress[y % ring_size] = y * stride + b
+                    cond.notify_all()
+                a = b
+            y += workers
+
+    def run(k):
+        try:
+            work(k)
+        except _Abort:
+            pass
+        except BaseException as e:
+            with cond:
+                state['error'] = e
+                cond.notify_all()
+
+    with cond:
+        for y in range(reach_y):
+            load(y)
+
+    threads = [threading.Thread(target=run, args=(k,)) for k in range(workers)]
+    for t in threads:
+        t.daemon = True
+        t.start()
+
+    try:
+        y = 0
+        while True:
+            with cond:
+                try:
+                    wait_for(lambda: progress[y % ring_size] >= y * stride + width or
+                             (state['height'] is not None and y >= state['height']))
+                except _Abort:
+                    raise state['error']
+                if progress[y % ring_size] < y * stride + width:
+                    break
+                # Kopia: miejsce w pierścieniu zaraz zajmie wiersz y + ring_size,
+                # a konsument może trzymać oddane wiersze
+                out = array('i', out_ring[y % ring_size])
+                state['emitted'] = y + 1
+                cond.notify_all()
+            yield out
+            y += 1
+    finally:
+        with cond:
+            state['stop'] = True
+            cond.notify_all()
+        for t in threads:
+            t.join()
+    if state['error'] is not None:
+        raise state['error']
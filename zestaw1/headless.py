@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Algorytmy zestawu 1 bez ImageJ: CPython + NumPy + PIL, z linią poleceń.
+
+Wyniki są identyczne piksel w piksel ze skryptami Jythona:
+- dyfuzja błędu (11a, 11b): ten sam silnik dithering.diffuse_rows
+  (łańcuch błędu wzdłuż wiersza jest sekwencyjny, więc nie da się go
+  zwektoryzować bez zmiany kolejności sumowania),
+- ordered dithering (14b, 15b): ścieżka NumPy z ordered.py,
+- skalowanie 9b (średnia dwóch najbliższych sąsiadów) i 9d ((max + min) / 2
+  z czterech sąsiadów): resample.py, wszystkie kanały naraz.
+
+Obraz wejściowy zamieniany jest na 8 bitów tak jak IJ.run(imp, "8-bit", "")
+dla RGB: (r + g + b) / 3 z zaokrągleniem.
+
+Przykłady:
+    python3 headless.py diffuse lwy.png out.png --kernel jarvis-judice-ninke --threshold 109
+    python3 headless.py diffuse lwy.png out.png --kernel jarvis-judice-ninke --five-levels
+    python3 headless.py ordered lwy.png out.png --matrix bayer4 --levels 0,64,128,192,255
+    python3 headless.py resample potworek_pixelart.png out.png --size 500x650 --method two-nearest
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+from PIL import Image
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dithering import KERNELS, diffuse_rows
+from ordered import MATRIX_3X3, bayer_matrix, dither_1bit_array, dither_levels_array
+from resample import METHODS, resample
+from pixel_views import load_image
+
+
+# === Wczytywanie ===
+
+def load_gray(path):
+    """Obraz 8-bitowy (uint8, H×W); RGB uśredniane jak konwersja "8-bit" w ImageJ."""
+    img = Image.open(path)
+    if img.mode == 'L':
+        return np.asarray(img, dtype=np.uint8)
+    rgb = load_image(path, 'RGB', np.float64)
+    w = 1.0 / 3.0
+    return (rgb[..., 0] * w + rgb[..., 1] * w + rgb[..., 2] * w + 0.5).astype(np.uint8)
+
+
+def load_rgb(path):
+    """Obraz RGB (uint8, H×W×3)."""
+    return load_image(path, 'RGB')
+
+
+# === Dyfuzja błędu (11a, 11b) ===
+
+def threshold_quantizer(threshold):
+    """Kwantyzacja 1-bitowa z 11a/11b: 255, gdy wartość >= threshold."""
+    return lambda val: 255 if val >= threshold else 0
+
+
+def range_quantizer(bounds, values):
+    """Kwantyzacja przedziałami: values[i] dla wartości < bounds[i], ostatnia powyżej."""
+    def quantize(val):
+        for bound, value in zip(bounds, values):
+            if val < bound:
+                return value
+        return values[-1]
+    return quantize
+
+
+# Przedziały 5 poziomów z 11b
+FIVE_LEVELS = ([20, 40, 60, 120], [0, 64, 128, 192, 255])
+
+
+def diffuse(img, quantize, kernel='floyd-steinberg', serpentine=False):
+    """Dyfuzja błędu obrazu uint8 H×W; zwraca uint8 H×W."""
+    h, w = img.shape
+    out = np.empty((h, w), dtype=np.uint8)
+    for y, row in enumerate(diffuse_rows(img.tolist(), w, quantize, kernel, serpentine)):
+        out[y] = row
+    return out
+
+
+# === Ordered dithering (14b, 15b) ===
+
+def threshold_matrix(name):
+    """'3x3' (14b), 'bayerN' (N = 2^k, 15b: bayer4) lub 'blueN' (blue noise N×N)."""
+    if name == '3x3':
+        return MATRIX_3X3
+    if name.startswith('bayer'):
+        return bayer_matrix(int(name[len('bayer'):]))
+    if name.startswith('blue'):
+        from blue_noise import blue_noise_matrix
+        return blue_noise_matrix(int(name[len('blue'):]))
+    raise ValueError("Unknown threshold matrix: %s" % name)
+
+
+def ordered_dither(img, matrix, levels=None):
+    """Ordered dithering: 1 bit (14b), gdy levels is None, inaczej paleta levels (15b)."""
+    if levels is None:
+        return dither_1bit_array(img, matrix)
+    return dither_levels_array(img, matrix, levels)
+
+
+# === Linia poleceń ===
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Zestaw 1 bez ImageJ: dithering i skalowanie')
+    sub = parser.add_subparsers(dest='command')
+    sub.required = True
+
+    p = sub.add_parser('diffuse', help='dyfuzja błędu (11a, 11b)')
+    p.add_argument('input')
+    p.add_argument('output')
+    p.add_argument('--kernel', default='floyd-steinberg', choices=sorted(KERNELS))
+    p.add_argument('--serpentine', action='store_true')
+    q = p.add_mutually_exclusive_group()
+    q.add_argument('--threshold', type=float, default=128, help='próg 1-bitowy T (11a, 11b: 109)')
+    q.add_argument('--five-levels', action='store_true', help='5 poziomów z 11b')
+
+    p = sub.add_parser('ordered', help='ordered dithering (14b, 15b)')
+    p.add_argument('input')
+    p.add_argument('output')
+    p.add_argument('--matrix', default='bayer4', help="'3x3', 'bayerN' lub 'blueN'")
+    p.add_argument('--levels', help='paleta, np. 0,64,128,192,255 (domyślnie 1 bit)')
+
+    p = sub.add_parser('resample', help="skalowanie RGB (9b, 9d, jądra rozdzielne)")
+    p.add_argument('input')
+    p.add_argument('output')
+    p.add_argument('--size', default='500x650', help='SZEROKOŚĆxWYSOKOŚĆ')
+    p.add_argument('--method', default='two-nearest', choices=METHODS)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'diffuse':
+        if args.five_levels:
+            quantize = range_quantizer(*FIVE_LEVELS)
+        else:
+            quantize = threshold_quantizer(args.threshold)
+        result = diffuse(load_gray(args.input), quantize, args.kernel, args.serpentine)
+    elif args.command == 'ordered':
+        levels = None
+        if args.levels:
+            levels = [int(v) for v in args.levels.split(',')]
+        result = ordered_dither(load_gray(args.input), threshold_matrix(args.matrix), levels)
+    else:
+        new_w, new_h = [int(v) for v in args.size.lower().split('x')]
+        result = resample(load_rgb(args.input), new_w, new_h, args.method)
+
+    Image.fromarray(result).save(args.output)
+    print('Zapisano: %s' % args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
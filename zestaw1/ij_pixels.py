@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Hurtowe przenoszenie pikseli między ImageProcessorami ImageJ a skryptami
+(Jython 2.7, ImageJ/Fiji).
+
+Każde wywołanie ip.getPixel/putPixel to osobne przejście przez most
+Jython -> Java, które przy pętli po pikselach dominuje czas działania.
+Obrazy 8-bitowe czytane są więc wierszami jako wycinki tablicy byte[]
+z getPixels() (gray_rows), a wynik zapisywany wiersz po wierszu do
+przygotowanego z góry byte[] nowego ByteProcessora (gray_from_rows) -
+w pamięci jako listy Pythona jest naraz tylko jeden wiersz, a nie cały
+obraz. Obrazy RGB przechodzą jednym wywołaniem getRGB/setRGB.
+"""
+from jarray import array, zeros
+from java.lang import System
+from ij.process import ByteProcessor, ColorProcessor
+
+
+def to_bytes(values):
+    """Wartości 0-255 -> byte[] (Java zna tylko bajty ze znakiem)."""
+    return array([(v & 0xff) - 256 if v & 0x80 else v & 0xff for v in values], 'b')
+
+
+def from_bytes(data):
+    """byte[] -> lista int 0-255."""
+    return [b & 0xff for b in data]
+
+
+# === Obrazy 8-bitowe ===
+
+def gray_rows(ip):
+    """Kolejne wiersze obrazu 8-bitowego jako listy int 0-255 (wycinki getPixels())."""
+    pixels = ip.getPixels()
+    w = ip.getWidth()
+    for y in range(ip.getHeight()):
+        yield [b & 0xff for b in pixels[y * w:(y + 1) * w]]
+
+
+def gray_from_rows(rows, w, h):
+    """
+    Nowy ByteProcessor w×h z wierszy wartości 0-255 (np. z diffuse_rows);
+    każdy wiersz od razu kopiowany do przygotowanej tablicy byte[].
+    """
+    data = zeros(w * h, 'b')
+    y = 0
+    for row in rows:
+        if y >= h or len(row) != w:
+            raise ValueError("Expected %d rows of %d pixels (row %d has %d)" % (h, w, y, len(row)))
+        System.arraycopy(to_bytes(row), 0, data, y * w, w)
+        y += 1
+    if y != h:
+        raise ValueError("Expected %d rows, got %d" % (h, y))
+    return ByteProcessor(w, h, data)
+
+
+# === Obrazy RGB ===
+
+def get_rgb(ip):
+    """Kanały obrazu RGB (ColorProcessor) jako trzy płaskie listy int 0-255."""
+    n = ip.getWidth() * ip.getHeight()
+    r, g, b = zeros(n, 'b'), zeros(n, 'b'), zeros(n, 'b')
+    ip.getRGB(r, g, b)
+    return from_bytes(r), from_bytes(g), from_bytes(b)
+
+
+def new_rgb(w, h, r, g, b):
+    """Nowy ColorProcessor w×h z trzech płaskich list kanałów 0-255."""
+    cp = ColorProcessor(w, h)
+    cp.setRGB(to_bytes(r), to_bytes(g), to_bytes(b))
+    return cp
+
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Dithering uporządkowany (ordered dithering) z kafelkowaną mapą progów.
+
+Macierz progów N×N liczona jest raz i powielana na szerokość obrazu,
+więc w pętli po pikselach zostaje tylko jedno porównanie (1 bit) albo
+jedno odwołanie do tablicy poziomów (paleta wielopoziomowa).
+
+- ścieżka wierszowa (czysty Python) działa w Jythonie 2.7 (ImageJ/Fiji)
+  i w CPythonie: generator wierszy wyjściowych, jak dithering.diffuse_rows,
+- ścieżka NumPy (gdy NumPy jest dostępne) porównuje cały obraz naraz:
+  obraz oglądany jest jako bloki N×N, a macierz progów rozgłaszana
+  (broadcasting) na wszystkie bloki bez kopiowania.
+
+Dla palety wielopoziomowej wynik zależy tylko od pary (szarość, komórka
+macierzy), więc tablica 256 × (N·N) liczona jest raz dla danej pary
+(macierz, paleta) i zapamiętywana; w pętli po pikselach nie ma już
+arytmetyki zmiennoprzecinkowej, tylko jedno odwołanie do tablicy.
+
+Wzory są takie same jak w skryptach zad14/zad15, więc wynik jest identyczny:
+- 1 bit (14b):        wyjście = 255, gdy g > ((D + 0.5) / M) * 255
+- N poziomów (15b):   v = int((g/255 + t/(L-1)) * (L-1)), t = (D + 0.5) / M
+gdzie M = N*N, L - liczba poziomów palety.
+"""
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Macierz 3x3 z zadania 14b
+MATRIX_3X3 = [
+    [7, 1, 5],
+    [3, 0, 2],
+    [4, 8, 6],
+]
+
+
+def bayer_matrix(size):
+    """Macierz Bayera size×size (size = 2^n), wartości 0..size²-1."""
+    if size < 1 or size & (size - 1):
+        raise ValueError("Bayer matrix size must be a power of two: %d" % size)
+    matrix = [[0]]
+    n = 1
+    while n < size:
+        # D_2n = [[4D, 4D+2], [4D+3, 4D+1]]
+        matrix = ([[4 * v for v in row] + [4 * v + 2 for v in row] for row in matrix] +
+                  [[4 * v + 3 for v in row] + [4 * v + 1 for v in row] for row in matrix])
+        n *= 2
+    return matrix
+
+
+def cell_offsets(matrix):
+    """
+    Progi t = (D + 0.5) / M w zakresie (0, 1) dla każdej komórki macierzy
+    (lista list; dla macierzy NumPy, np. blue_noise_matrix - tablica float64).
+    """
+    cells = float(len(matrix) * len(matrix[0]))
+    if np is not None and isinstance(matrix, np.ndarray):
+        return (matrix.astype(np.float64) + 0.5) / cells
+    return [[(float(d) + 0.5) / cells for d in row] for row in matrix]
+
+
+def tile_rows(values, width):
+    """Powiel każdy wiersz macierzy na szerokość width."""
+    tiled = []
+    for row in values:
+        repeat = width // len(row) + 1
+        tiled.append((list(row) * repeat)[:width])
+    return tiled
+
+
+# (macierz, paleta) -> tablica poziomów
+_level_tables = {}
+
+
+def level_table(matrix, levels):
+    """
+    Tablica wyjść dla palety wielopoziomowej: element g * (N·N) + k to
+    poziom dla szarości g w komórce k macierzy (k = wiersz * N + kolumna).
+    Liczona raz dla pary (macierz, paleta), zwracana jako array('B').
+    """
+    key = (_matrix_key(matrix), tuple(levels))
+    table = _level_tables.get(key)
+    if table is None and np is not None and isinstance(matrix, np.ndarray):
+        table = _level_table_numpy(matrix, levels)
+        _level_tables[key] = table
+    if table is None:
+        steps = len(levels) - 1
+        offsets = [t / float(steps) for row in cell_offsets(matrix) for t in row]
+        table = array('B', [0] * (256 * len(offsets)))
+        i = 0
+        for g in range(256):
+            norm = float(g) / 255.0
+            for offset in offsets:
+                v = int((norm + offset) * float(steps))
+                if v < 0:
+                    v = 0
+                if v > steps:
+                    v = steps
+                table[i] = levels[v]
+                i += 1
+        _level_tables[key] = table
+    return table
+
+
+def _matrix_key(matrix):
+    if np is not None and isinstance(matrix, np.ndarray):
+        return (matrix.shape, matrix.astype(np.int64).tobytes())
+    return tuple([tuple(row) for row in matrix])
+
+
+def _level_table_numpy(matrix, levels):
+    """
+    level_table dla macierzy NumPy (np. blue noise 256×256: 16,7 mln
+    elementów) bez pętli po elementach. Dla komórek posortowanych po
+    progu (np.argsort) poziom rośnie z progiem, więc wiersz szarości g to
+    kolejne poziomy palety powtórzone tyle razy, ile komórek mieści się
+    między granicami. Granice szukane są bisekcją tym samym wzorem float
+    co w pętli (wynik identyczny), a wiersze trafiają na komórki macierzy
+    jednym przypisaniem.
+    """
+    steps = len(levels) - 1
+    flat = matrix.ravel()
+    order = np.argsort(flat, kind='stable')
+    offsets = ((flat[order].astype(np.float64) + 0.5) / float(flat.size)) / float(steps)
+    norm = np.arange(256, dtype=np.float64)[:, None] / 255.0
+    # bounds[g, j-1] - pierwsza komórka (w porządku progów) z poziomem >= j
+    targets = np.arange(1, steps + 1, dtype=np.float64)
+    lo = np.zeros((256, steps), dtype=np.intp)
+    hi = np.full((256, steps), flat.size, dtype=np.intp)
+    while np.any(lo < hi):
+        mid = (lo + hi) // 2
+        reached = (norm + offsets[np.minimum(mid, flat.size - 1)]) * float(steps) >= targets
+        reached |= mid >= flat.size
+        hi = np.where(reached, mid, hi)
+        lo = np.where(reached, lo, mid + 1)
+    counts = np.diff(np.concatenate([np.zeros((256, 1), np.intp), lo,
+                                     np.full((256, 1), flat.size, np.intp)], axis=1), axis=1)
+    palette = np.asarray(levels, dtype=np.uint8)
+    table = np.empty((256, flat.size), dtype=np.uint8)
+    table[:, order] = np.stack([np.repeat(palette, row) for row in counts])
+    return array('B', table.tobytes())
+
+
+def cell_index_rows(matrix, width):
+    """Numery komórek macierzy (wiersz * N + kolumna) powielone na szerokość width."""
+    m = len(matrix[0])
+    return tile_rows([[r * m + c for c in range(m)] for r in range(len(matrix))], width)
+
+
+def dither_1bit_rows(rows, width, matrix):
+    """
+    Ordered dithering do palety 1-bitowej {0, 255}, wiersz po wierszu.
+    Zwraca generator wierszy wyjściowych (array('i')).
+    """
+    thresholds = tile_rows([[t * 255.0 for t in row] for row in cell_offsets(matrix)], width)
+    n = len(thresholds)
+    for y, row in enumerate(rows):
+        t_row = thresholds[y % n]
+        yield array('i', [255 if float(g) > t else 0 for g, t in zip(row, t_row)])
+
+
+def dither_levels_rows(rows, width, matrix, levels):
+    """
+    Ordered dithering do palety wielopoziomowej levels (rosnąco), wiersz po wierszu.
+    Każdy piksel to jedno odwołanie do tablicy level_table.
+    Zwraca generator wierszy wyjściowych (array('i')).
+    """
+    table = level_table(matrix, levels)
+    cells = len(matrix) * len(matrix[0])
+    cell_rows = cell_index_rows(matrix, width)
+    n = len(cell_rows)
+    for y, row in enumerate(rows):
+        yield array('i', [table[g * cells + k] for g, k in zip(row, cell_rows[y % n])])
+
+
+# === Ścieżka NumPy (cały obraz naraz) ===
+
+def _blocks(img, n, m):
+    """Obraz dopełniony do wielokrotności n×m i oglądany jako bloki (H/n, n, W/m, m)."""
+    h, w = img.shape
+    ph, pw = -h % n, -w % m
+    if ph or pw:
+        img = np.pad(img, ((0, ph), (0, pw)), mode='edge')
+    return img.reshape((h + ph) // n, n, (w + pw) // m, m)
+
+
+def _unblock(blocks, shape):
+    nb_y, n, nb_x, m = blocks.shape
+    return blocks.reshape(nb_y * n, nb_x * m)[:shape[0], :shape[1]]
+
+
+def dither_1bit_array(img, matrix):
+    """Ordered dithering 1-bit dla całego obrazu uint8 jednym porównaniem (NumPy)."""
+    if np is None:
+        raise ImportError("dither_1bit_array requires NumPy")
+    img = np.asarray(img, dtype=np.uint8)
+    thresholds = np.asarray(cell_offsets(matrix)) * 255.0
+    n, m = thresholds.shape
+    mask = _blocks(img, n, m) > thresholds[None, :, None, :]
+    return _unblock(np.where(mask, np.uint8(255), np.uint8(0)), img.shape)
+
+
+def dither_levels_array(img, matrix, levels):
+    """
+    Ordered dithering do palety levels dla całego obrazu uint8 (NumPy):
+    jedno dwuwymiarowe odwołanie do tablicy (szarość, komórka) na piksel.
+    """
+    if np is None:
+        raise ImportError("dither_levels_array requires NumPy")
+    img = np.asarray(img, dtype=np.uint8)
+    n, m = len(matrix), len(matrix[0])
+    table = np.frombuffer(level_table(matrix, levels), dtype=np.uint8).reshape(256, n * m)
+    cells = np.arange(n * m).reshape(n, m)
+    return _unblock(table[_blocks(img, n, m), cells[None, :, None, :]], img.shape)
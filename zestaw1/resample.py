@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Skalowanie obrazów z zadania 9 jako operacje na całych tablicach NumPy.
+
+Reguły 9b (średnia dwóch najbliższych z czterech sąsiadów) i 9d
+((max + min) / 2 z czterech sąsiadów) zależą od wartości pikseli tylko
+przez odczyt sąsiadów. Współrzędne źródłowe, sąsiedzi i ranking
+odległości wynikają wyłącznie z rozmiarów obrazów, więc liczone są raz
+jako siatki indeksów do spłaszczonego obrazu, a potem jednym odczytem
+obsługują wszystkie kanały naraz.
+
+Wynik jest identyczny z pętlami w 9b.py / 9d.py:
+- współrzędne src = x_out * (w_in / new_w) w float64, jak w Pythonie,
+- ranking odległości sortowaniem stabilnym (remisy w kolejności sąsiadów
+  (x0,y0), (x1,y0), (x0,y1), (x1,y1), jak sorted() w 9b),
+- int((v1 + v2) / 2.0) i int((max + min) / 2.0) dla liczb nieujemnych
+  to dzielenie całkowite, więc po odczycie sąsiadów nie ma już float.
+
+Plan skalowania (ResamplePlan) dla danej pary rozmiarów i metody trzyma
+te tablice i jest zapamiętywany w pamięci LRU (plan_for), więc kolejne
+obrazy tego samego rozmiaru korzystają z gotowych indeksów i wag. Na tej
+samej maszynerii działają klasyczne jądra rozdzielne: 'bilinear',
+'bicubic' (Keys, a = -0.5) i 'lanczos' (a = 3) - tablice indeksów i wag
+osobno dla osi x i y, liczone tak jak w PIL (Image.resize): przy
+zmniejszaniu jądro poszerzane o skalę (antyaliasing), okno obcinane na
+brzegach obrazu i wagi normalizowane do sumy 1, wagi stałoprzecinkowe
+(22 bity). Najpierw oś x, wynik zaokrąglany i obcinany do uint8, potem
+oś y; oś, której rozmiar się nie zmienia, jest pomijana. Wynik jest
+identyczny z Image.resize dla obrazów L i RGB.
+
+Plan potrafi też liczyć wyjście pasami wierszy (source_rows, apply_strip),
+co wykorzystuje skalowanie strumieniowe w stream_resample.py.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+# Liczba zapamiętanych planów (para rozmiarów + metoda)
+PLAN_CACHE_SIZE = 64
+
+
+def neighbor_axis(n_in, n_out):
+    """
+    Tablice jednej osi dla reguł 9b/9d: współrzędne źródłowe
+    src = i * (n_in / n_out) oraz sąsiedzi floor(src) i min(floor(src) + 1, n_in - 1).
+    """
+    src = np.arange(n_out) * (float(n_in) / n_out)
+    c0 = np.floor(src).astype(np.intp)
+    c1 = np.minimum(c0 + 1, n_in - 1)
+    return src, c0, c1
+
+
+def neighbor_grid(w_in, h_in, new_w, new_h, y_start=0, y_stop=None):
+    """
+    Indeksy czterech sąsiadów pikseli wyjściowych z wierszy [y_start, y_stop)
+    w spłaszczonym obrazie wejściowym: tablica (4, wiersze, new_w) w kolejności
+    (x0,y0), (x1,y0), (x0,y1), (x1,y1), oraz odległości do nich (float64).
+    """
+    src_x, x0, x1 = neighbor_axis(w_in, new_w)
+    src_y, y0, y1 = [t[y_start:y_stop] for t in neighbor_axis(h_in, new_h)]
+
+    xs = (x0, x1, x0, x1)
+    ys = (y0, y0, y1, y1)
+    index = np.stack([y[:, None] * w_in + x[None, :] for x, y in zip(xs, ys)])
+    # Odległości jak w 9b: sqrt((src_x - x)**2 + (src_y - y)**2)
+    dists = np.stack([np.sqrt((src_x - x)[None, :] ** 2 + (src_y - y)[:, None] ** 2)
+                      for x, y in zip(xs, ys)])
+    return index, dists
+
+
+def two_nearest_grid(w_in, h_in, new_w, new_h, y_start=0, y_stop=None):
+    """Indeksy (2, wiersze, new_w) dwóch najbliższych sąsiadów (ranking liczony raz)."""
+    index, dists = neighbor_grid(w_in, h_in, new_w, new_h, y_start, y_stop)
+    order = np.argsort(dists, axis=0, kind='stable')[:2]
+    return np.take_along_axis(index, order, axis=0)
+
+
+def _neighbor_index(w_in, h_in, new_w, new_h, y_start=0, y_stop=None):
+    return neighbor_grid(w_in, h_in, new_w, new_h, y_start, y_stop)[0]
+
+
+# === Jądra rozdzielne ===
+# Wzory i kolejność działań jak w Resample.c z PIL, żeby wagi były identyczne
+
+def _bilinear(t):
+    t = np.abs(t)
+    return np.where(t < 1.0, 1.0 - t, 0.0)
+
+
+def _bicubic(t, a=-0.5):
+    t = np.abs(t)
+    near = ((a + 2.0) * t - (a + 3.0)) * t * t + 1.0
+    far = (((t - 5.0) * t + 8.0) * t - 4.0) * a
+    return np.where(t < 1.0, near, np.where(t < 2.0, far, 0.0))
+
+
+def _sinc(t):
+    x = np.where(t == 0.0, 1.0, t) * np.pi
+    return np.where(t == 0.0, 1.0, np.sin(x) / x)
+
+
+def _lanczos(t, a=3.0):
+    return np.where((t >= -a) & (t < a), _sinc(t) * _sinc(t / a), 0.0)
+
+
+# nazwa -> (jądro, promień)
+KERNELS = {
+    'bilinear': (_bilinear, 1.0),
+    'bicubic': (_bicubic, 2.0),
+    'lanczos': (_lanczos, 3.0),
+}
+
+# Bity części ułamkowej wag stałoprzecinkowych (PRECISION_BITS w PIL)
+PRECISION_BITS = 32 - 8 - 2
+
+
+def axis_table(n_in, n_out, kernel, radius):
+    """
+    Indeksy i wagi stałoprzecinkowe (n_out, taps) jednej osi: piksel wyjściowy
+    i to (suma wag[i] * wejście[indeksy[i]] + 2**(PRECISION_BITS-1)) >> PRECISION_BITS.
+    Okno [xmin, xmin + xmax) jak w PIL (precompute_coeffs): środek
+    (i + 0.5) * skala, obcięte do obrazu; nadmiarowe pozycje mają wagę 0
+    i powtarzają ostatni indeks okna.
+    """
+    scale = float(n_in) / n_out
+    filterscale = max(scale, 1.0)
+    support = radius * filterscale
+    taps = int(np.ceil(support)) * 2 + 1
+    center = (np.arange(n_out) + 0.5) * scale
+    # (int) w C obcina w stronę zera, jak astype
+    xmin = np.maximum((center - support + 0.5).astype(np.intp), 0)
+    xmax = np.minimum((center + support + 0.5).astype(np.intp), n_in) - xmin
+    offsets = np.arange(taps)[None, :]
+    valid = offsets < xmax[:, None]
+    weights = kernel((offsets + xmin[:, None] - center[:, None] + 0.5) * (1.0 / filterscale))
+    weights = np.where(valid, weights, 0.0)
+    # Suma po kolei, jak pętla w C
+    total = np.zeros(n_out)
+    for t in range(taps):
+        total += weights[:, t]
+    weights = np.where(total[:, None] != 0.0, weights / np.where(total == 0.0, 1.0, total)[:, None], weights)
+    fixed = weights * (1 << PRECISION_BITS)
+    fixed = np.trunc(np.where(fixed < 0, fixed - 0.5, fixed + 0.5)).astype(np.int64)
+    index = xmin[:, None] + np.minimum(offsets, np.maximum(xmax, 1)[:, None] - 1)
+    return index, fixed
+
+
+# === Plan skalowania ===
+
+class ResamplePlan(object):
+    """
+    Tablice skalowania w_in×h_in -> new_w×new_h dla jednej metody,
+    liczone raz i używane dla wszystkich kanałów i obrazów tego rozmiaru.
+
+    Plan trzyma tablice osi; pełne siatki sąsiadów reguł 9b/9d powstają
+    przy pierwszym skalowaniu całego obrazu. Przy skalowaniu pasami
+    (apply_strip) liczone są tylko siatki danego pasa.
+    """
+
+    def __init__(self, w_in, h_in, new_w, new_h, method):
+        self.src_size = (w_in, h_in)
+        self.size = (new_w, new_h)
+        self.method = method
+        if method in ('two-nearest', 'min-max'):
+            self.y_rows = neighbor_axis(h_in, new_h)[1:]
+            self._grid = None
+        elif method in KERNELS:
+            kernel, radius = KERNELS[method]
+            # Oś bez zmiany rozmiaru pomijana (None), jak w PIL
+            self.x_table = axis_table(w_in, new_w, kernel, radius) if w_in != new_w else None
+            self.y_table = axis_table(h_in, new_h, kernel, radius) if h_in != new_h else None
+        else:
+            raise ValueError("Unknown resampling method: %s (known: %s)"
+                             % (method, ", ".join(METHODS)))
+
+    def source_rows(self, y_start, y_stop):
+        """Zakres [lo, hi) wierszy źródła potrzebnych dla wierszy wyjścia [y_start, y_stop)."""
+        if self.method in KERNELS:
+            if self.y_table is None:
+                return y_start, y_stop
+            rows = self.y_table[0][y_start:y_stop]
+            return int(rows.min()), int(rows.max()) + 1
+        y0, y1 = self.y_rows
+        return int(y0[y_start]), int(y1[y_stop - 1]) + 1
+
+    def apply(self, img):
+        """Skaluj obraz uint8 (H, W) lub (H, W, C) o rozmiarze src_size."""
+        img = np.asarray(img)
+        if (img.shape[1], img.shape[0]) != self.src_size:
+            raise ValueError("Plan for %dx%d applied to %dx%d image"
+                             % (self.src_size + (img.shape[1], img.shape[0])))
+        return self.apply_strip(img, 0, 0, self.size[1])
+
+    def apply_strip(self, rows, lo, y_start, y_stop):
+        """
+        Wiersze wyjścia [y_start, y_stop) z wierszy źródła rows, zaczynających
+        się od wiersza lo (co najmniej zakres source_rows(y_start, y_stop)).
+        """
+        w_in = self.src_size[0]
+        new_w = self.size[0]
+        whole = (y_start, y_stop) == (0, self.size[1])
+        if self.method in KERNELS:
+            values = self._separable(rows, lo, y_start, y_stop)
+        else:
+            index = self._grid if whole else None
+            if index is None:
+                grid = two_nearest_grid if self.method == 'two-nearest' else _neighbor_index
+                index = grid(w_in, self.src_size[1], new_w, self.size[1], y_start, y_stop)
+                if whole:
+                    self._grid = index
+            vals = _flat_channels(rows).astype(np.uint16)[index - lo * w_in]
+            if self.method == 'two-nearest':
+                values = (vals[0] + vals[1]) // 2
+            else:
+                values = (vals.max(axis=0) + vals.min(axis=0)) // 2
+        return _shape_output(values, rows, new_w, y_stop - y_start)
+
+    def _separable(self, rows, lo, y_start, y_stop):
+        channels = _flat_channels(rows).reshape(rows.shape[0], self.src_size[0], -1)
+        # Najpierw oś x (wiersze, new_w, C), zaokrąglenie do uint8, potem oś y
+        if self.x_table is not None:
+            channels = _fixed_point_pass(channels, self.x_table, 1)
+        if self.y_table is None:
+            return channels[y_start - lo:y_stop - lo]
+        y_index, y_weights = [t[y_start:y_stop] for t in self.y_table]
+        return _fixed_point_pass(channels, (y_index - lo, y_weights), 0)
+
+
+def _fixed_point_pass(img, table, axis):
+    """
+    Jedna oś (0 - wiersze, 1 - kolumny) skalowania obrazu uint8 (H, W, C):
+    suma wag stałoprzecinkowych w int64, zaokrąglenie i obcięcie do 0..255
+    jak clip8 w PIL. Pętla po wagach okna, a nie po pikselach.
+    """
+    index, weights = table
+    src = np.moveaxis(img, axis, 0)
+    acc = np.full((len(index),) + src.shape[1:], 1 << (PRECISION_BITS - 1), dtype=np.int64)
+    for t in range(index.shape[1]):
+        acc += src[index[:, t]] * weights[:, t, None, None]
+    return np.moveaxis(np.clip(acc >> PRECISION_BITS, 0, 255).astype(np.uint8), 0, axis)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def plan_for(w_in, h_in, new_w, new_h, method):
+    """Plan skalowania z pamięci LRU (liczony przy pierwszym użyciu danej pary rozmiarów)."""
+    return ResamplePlan(w_in, h_in, new_w, new_h, method)
+
+
+def _flat_channels(img):
+    """Obraz (H, W) lub (H, W, C) jako tablica (H*W, C) bez kopiowania."""
+    img = np.asarray(img)
+    channels = img.shape[2] if img.ndim == 3 else 1
+    return img.reshape(img.shape[0] * img.shape[1], channels)
+
+
+def _shape_output(values, img, new_w, n_rows):
+    shape = (n_rows, new_w) + np.shape(img)[2:]
+    return values.reshape(shape).astype(np.uint8)
+
+
+def two_nearest_average(img, new_w, new_h):
+    """9b dla obrazu uint8 (H, W) lub (H, W, C): wszystkie kanały jednym odczytem."""
+    return resample(img, new_w, new_h, 'two-nearest')
+
+
+def custom_interpolate(img, new_w, new_h):
+    """9d dla obrazu uint8 (H, W) lub (H, W, C): wszystkie kanały jednym odczytem."""
+    return resample(img, new_w, new_h, 'min-max')
+
+
+# Reguły z zadania 9 i jądra rozdzielne
+METHODS = ('two-nearest', 'min-max') + tuple(sorted(KERNELS))
+
+
+def resample(img, new_w, new_h, method='two-nearest'):
+    """
+    Skalowanie obrazu uint8 (H, W) lub (H, W, C) metodą z METHODS:
+    'two-nearest' (9b), 'min-max' (9d), 'bilinear', 'bicubic', 'lanczos'.
+    """
+    h_in, w_in = np.shape(img)[:2]
+    return plan_for(w_in, h_in, new_w, new_h, method).apply(img)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Skalowanie strumieniowe obrazów większych niż pamięć operacyjna.
+
+Wyjście liczone jest poziomymi pasami po strip_rows wierszy. Każdy pas
+pobiera ze źródła tylko wiersze, których potrzebuje (plan.source_rows),
+i jest od razu zapisywany, więc zużycie pamięci zależy od wysokości pasa,
+a nie od rozmiaru obrazu. Metody i wyniki są takie same jak w resample.py
+(9b, 9d, bilinear, bicubic, lanczos); skalowanie pasami daje obraz
+identyczny ze skalowaniem całości.
+
+Źródła wierszy:
+- .npy - np.load(..., mmap_mode='r'),
+- surowy plik uint8 (dowolne inne rozszerzenie) - np.memmap o podanym kształcie,
+- .png - dekodowanie porcjami wierszy (zlib + odwracanie filtrów PNG),
+  bez wczytywania całego obrazu; 8 bitów, bez przeplotu, skala szarości,
+  szarość z alfą, RGB lub RGBA. Filtry Average i Paeth zależą od już
+  zdekodowanego sąsiada z lewej, więc nie da się ich policzyć wektorowo
+  na całym wierszu; porcja przefiltrowanych wierszy (poprzedzona ostatnim
+  zdekodowanym wierszem z filtrem 0) trafia więc do dekodera 'zip' z PIL,
+  który odwraca wszystkie pięć filtrów w C.
+
+Ujścia: .npy (np.lib.format.open_memmap) albo .png (kompresja strumieniowa).
+
+Przykład:
+    python3 stream_resample.py mapa.png mapa_x4.png 40000x40000 --method bilinear
+"""
+import argparse
+import os
+import struct
+import sys
+import zlib
+
+import numpy as np
+from PIL import Image
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from resample import METHODS, plan_for
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# typ koloru PNG -> liczba kanałów (8 bitów na kanał)
+PNG_CHANNELS = {0: 1, 4: 2, 2: 3, 6: 4}
+# typ koloru PNG -> tryb PIL
+PNG_MODES = {0: 'L', 4: 'LA', 2: 'RGB', 6: 'RGBA'}
+# Wiersze rozpakowywane i odfiltrowywane naraz
+PNG_BATCH_ROWS = 256
+
+
+# === Źródła wierszy ===
+
+class RowSource(object):
+    """
+    Źródło wierszy: rows(lo, hi) i shape. Zamykane przez close() albo
+    instrukcję with (także gdy odczyt przerwie wyjątek).
+    """
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ArrayRows(RowSource):
+    """Wiersze tablicy (np. np.memmap) - odczyt tylko potrzebnego zakresu."""
+
+    def __init__(self, array):
+        self.array = array
+        self.shape = array.shape
+
+    def rows(self, lo, hi):
+        return np.asarray(self.array[lo:hi])
+
+
+class PngRows(RowSource):
+    """
+    Wiersze pliku PNG dekodowane na żądanie. Zakresy muszą być
+    pobierane w kolejności niemalejącej (jak przy skalowaniu pasami);
+    w pamięci zostają tylko wiersze od początku ostatniego zakresu.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self._read_header(path)
+        except BaseException:
+            self.file.close()
+            raise
+        self._decoded = self._decode()
+        self._buffer = []
+        self._start = 0
+
+    def _read_header(self, path):
+        if self.file.read(8) != PNG_SIGNATURE:
+            raise ValueError("Not a PNG file: %s" % path)
+        kind, data = self._chunk()
+        if kind != b'IHDR':
+            raise ValueError("PNG without IHDR: %s" % path)
+        w, h, depth, color, _, _, interlace = struct.unpack('>IIBBBBB', data)
+        if depth != 8 or color not in PNG_CHANNELS or interlace:
+            raise ValueError("Unsupported PNG (need 8-bit gray/RGB(A), no interlace): %s" % path)
+        channels = PNG_CHANNELS[color]
+        self.shape = (h, w) if channels == 1 else (h, w, channels)
+        self.mode = PNG_MODES[color]
+        self.stride = w * channels
+
+    def close(self):
+        # Przerwany generator zamyka plik w finally, nieuruchomiony - nie
+        self._decoded.close()
+        self.file.close()
+
+    def _chunk(self):
+        header = self.file.read(8)
+        if len(header) < 8:
+            raise ValueError("Truncated PNG file: %s" % self.file.name)
+        length, kind = struct.unpack('>I4s', header)
+        data = self.file.read(length)
+        self.file.read(4)  # CRC
+        return kind, data
+
+    def _decode(self):
+        inflater = zlib.decompressobj()
+        line_size = self.stride + 1
+        h = self.shape[0]
+        pending = b''
+        data = b''
+        previous = bytes(self.stride)
+        produced = 0
+        try:
+            while produced < h:
+                if not data:
+                    kind, data = self._chunk()
+                    if kind == b'IEND':
+                        break
+                    if kind != b'IDAT':
+                        data = b''
+                        continue
+                # Rozpakowanie najwyżej PNG_BATCH_ROWS wierszy naraz
+                pending += inflater.decompress(data, PNG_BATCH_ROWS * line_size)
+                data = inflater.unconsumed_tail
+                n = min(len(pending) // line_size, h - produced)
+                if not n:
+                    continue
+                rows = self._unfilter(pending[:n * line_size], n, previous)
+                pending = pending[n * line_size:]
+                previous = rows[-1].tobytes()
+                produced += n
+                for row in rows:
+                    yield row
+        finally:
+            self.file.close()
+        if produced < h:
+            raise ValueError("Truncated PNG data: %d of %d rows" % (produced, h))
+
+    def _unfilter(self, lines, n, previous):
+        """
+        n przefiltrowanych wierszy (z bajtami typu filtra) -> tablica (n, W[, C]).
+        Poprzedni wiersz dołączony z filtrem 0 jest kontekstem dla Up, Average i Paeth.
+        """
+        raw = zlib.compress(b'\x00' + previous + lines, 0)
+        try:
+            img = Image.frombytes(self.mode, (self.shape[1], n + 1), raw, 'zip', self.mode)
+        except ValueError:
+            raise ValueError("Invalid PNG filter data in %s" % self.file.name)
+        return np.asarray(img)[1:]
+
+    def rows(self, lo, hi):
+        if lo < self._start:
+            raise ValueError("PNG rows must be requested in order (%d < %d)" % (lo, self._start))
+        # Wiersze przed lo nie będą już potrzebne
+        drop = min(lo - self._start, len(self._buffer))
+        del self._buffer[:drop]
+        self._start += drop
+        while self._start + len(self._buffer) < lo:
+            next(self._decoded)
+            self._start += 1
+        while self._start + len(self._buffer) < hi:
+            self._buffer.append(next(self._decoded))
+        return np.stack(self._buffer[lo - self._start:hi - self._start])
+
+
+def open_source(path, shape=None):
+    """Źródło wierszy dla pliku .npy, .png albo surowego uint8 o kształcie shape (H, W[, C])."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npy':
+        return ArrayRows(np.load(path, mmap_mode='r'))
+    if ext == '.png':
+        return PngRows(path)
+    if shape is None:
+        raise ValueError("Raw source %s needs an explicit shape (H, W[, C])" % path)
+    return ArrayRows(np.memmap(path, dtype=np.uint8, mode='r', shape=tuple(shape)))
+
+
+# === Ujścia pasów ===
+
+class NpyStrips(object):
+    """Zapis pasów do pliku .npy odwzorowanego w pamięci."""
+
+    def __init__(self, path, shape):
+        self.array = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=shape)
+
+    def write(self, y, strip):
+        self.array[y:y + strip.shape[0]] = strip
+
+    def close(self):
+        self.array.flush()
+        del self.array
+
+
+class PngStrips(object):
+    """Zapis pasów do PNG: wiersze kompresowane na bieżąco, dane IDAT w kawałkach."""
+
+    def __init__(self, path, shape, chunk_size=1 << 20):
+        channels = shape[2] if len(shape) == 3 else 1
+        color = dict((c, t) for t, c in PNG_CHANNELS.items())[channels]
+        self.file = open(path, 'wb')
+        self.file.write(PNG_SIGNATURE)
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', shape[1], shape[0], 8, color, 0, 0, 0))
+        self.deflater = zlib.compressobj()
+        self.pending = b''
+        self.chunk_size = chunk_size
+
+    def _chunk(self, kind, data):
+        self.file.write(struct.pack('>I', len(data)) + kind + data)
+        self.file.write(struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+    def _flush(self, force=False):
+        while len(self.pending) >= self.chunk_size or (force and self.pending):
+            self._chunk(b'IDAT', self.pending[:self.chunk_size])
+            self.pending = self.pending[self.chunk_size:]
+
+    def write(self, y, strip):
+        # Filtr 0 (None) - każdy wiersz poprzedzony bajtem typu filtra
+        lines = strip.reshape(strip.shape[0], -1)
+        data = np.hstack([np.zeros((lines.shape[0], 1), dtype=np.uint8), lines])
+        self.pending += self.deflater.compress(data.tobytes())
+        self._flush()
+
+    def close(self):
+        self.pending += self.deflater.flush()
+        self._flush(force=True)
+        self._chunk(b'IEND', b'')
+        self.file.close()
+
+
+def open_sink(path, shape):
+    """Ujście pasów dla pliku .npy albo .png."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npy':
+        return NpyStrips(path, shape)
+    if ext == '.png':
+        return PngStrips(path, shape)
+    raise ValueError("Unsupported output format: %s (use .npy or .png)" % path)
+
+
+# === Skalowanie pasami ===
+
+def resample_strips(source, new_w, new_h, method='bilinear', strip_rows=256):
+    """Generator (y, pas) kolejnych pasów wyjścia dla źródła wierszy source."""
+    h_in, w_in = source.shape[:2]
+    plan = plan_for(w_in, h_in, new_w, new_h, method)
+    for y_start in range(0, new_h, strip_rows):
+        y_stop = min(new_h, y_start + strip_rows)
+        lo, hi = plan.source_rows(y_start, y_stop)
+        yield y_start, plan.apply_strip(source.rows(lo, hi), lo, y_start, y_stop)
+
+
+def resample_file(src_path, dst_path, new_w, new_h, method='bilinear',
+                  strip_rows=256, shape=None):
+    """Skaluj plik src_path do dst_path pasami po strip_rows wierszy."""
+    with open_source(src_path, shape) as source:
+        sink = open_sink(dst_path, (new_h, new_w) + tuple(source.shape[2:]))
+        try:
+            for y, strip in resample_strips(source, new_w, new_h, method, strip_rows):
+                sink.write(y, strip)
+        finally:
+            sink.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Skalowanie strumieniowe pasami wierszy')
+    parser.add_argument('input', help='.npy, .png albo surowy uint8 (wtedy --shape)')
+    parser.add_argument('output', help='.npy albo .png')
+    parser.add_argument('size', help='SZEROKOŚĆxWYSOKOŚĆ wyjścia')
+    parser.add_argument('--method', default='bilinear', choices=METHODS)
+    parser.add_argument('--strip-rows', type=int, default=256)
+    parser.add_argument('--shape', help='kształt surowego wejścia: HxW albo HxWxC')
+    args = parser.parse_args(argv)
+
+    new_w, new_h = [int(v) for v in args.size.lower().split('x')]
+    shape = [int(v) for v in args.shape.lower().split('x')] if args.shape else None
+    resample_file(args.input, args.output, new_w, new_h, args.method, args.strip_rows, shape)
+    print('Zapisano: %s' % args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
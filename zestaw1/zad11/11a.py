@@ -1,11 +1,24 @@
+import os
+import sys
 from ij import IJ, ImagePlus
-from ij.process import ByteProcessor
 from ij.gui import GenericDialog
+from java.lang import Runtime
 
 # === USER INPUT ===
 input_path = "/home/mryduchowski1/obrazy repo/zestaw1/zad11/lwy.png"
 output_path = "/home/mryduchowski1/obrazy repo/zestaw1/zad11/lwy_dithered.png"
 
+# Shared zestaw1 modules live one level above this task's folder
+sys.path.append(os.path.dirname(os.path.dirname(input_path)))
+from dithering import diffuse_rows
+from ij_pixels import gray_rows, gray_from_rows
+
+# Diffusion kernel from the shared registry (see dithering.KERNELS)
+KERNEL = "floyd-steinberg"
+SERPENTINE = False
+# Rows dithered concurrently (wavefront); output is identical to 1 worker
+WORKERS = 1 if SERPENTINE else Runtime.getRuntime().availableProcessors()
+
 # Dialog for threshold input
 gd = GenericDialog("Floyd-Steinberg Dithering")
 gd.addNumericField("Enter threshold T (0-255):", 128, 0)
@@ -26,40 +39,16 @@ else:
         w = ip.getWidth()
         h = ip.getHeight()
         
-        # Create a float array for processing
-        pixels = [[0.0 for x in range(w)] for y in range(h)]
-        
-        # Copy pixels to float array
-        for y in range(h):
-            for x in range(w):
-                pixels[y][x] = float(ip.getPixel(x, y))
+        def quantize_1bit(val):
+            return 255 if val >= T else 0
         
         # === FLOYD-STEINBERG DITHERING ===
-        for y in range(h):
-            for x in range(w):
-                old_pixel = pixels[y][x]
-                new_pixel = 255 if old_pixel >= T else 0
-                pixels[y][x] = new_pixel
-                error = old_pixel - new_pixel
-                
-                # Distribute the error to neighbors
-                if x + 1 < w:
-                    pixels[y][x + 1] += error * 7.0 / 16.0
-                if x - 1 >= 0 and y + 1 < h:
-                    pixels[y + 1][x - 1] += error * 3.0 / 16.0
-                if y + 1 < h:
-                    pixels[y + 1][x] += error * 5.0 / 16.0
-                if x + 1 < w and y + 1 < h:
-                    pixels[y + 1][x + 1] += error * 1.0 / 16.0
+        # Rows are sliced from the source byte[], dithered through a small
+        # ring of error rows and copied straight into the output byte[]
+        rows = diffuse_rows(gray_rows(ip), w, quantize_1bit, KERNEL, SERPENTINE, WORKERS)
+        result_ip = gray_from_rows(rows, w, h)
         
         # === SAVE OUTPUT ===
-        # Create new ByteProcessor and set pixels
-        result_ip = ByteProcessor(w, h)
-        for y in range(h):
-            for x in range(w):
-                val = int(max(0, min(255, pixels[y][x])))
-                result_ip.putPixel(x, y, val)
-        
         result_imp = ImagePlus("Dithered", result_ip)
         IJ.saveAs(result_imp, "PNG", output_path)
-        print("Dithering complete. Saved to " + output_path)
\ No newline at end of file
+        print("Dithering complete. Saved to " + output_path)
@@ -1,10 +1,16 @@
+import os
+import sys
 from ij import IJ, ImagePlus
-from ij.process import ByteProcessor
 
 # === Load grayscale image ===
 input_path = "/home/mryduchowski1/obrazy repo/zestaw1/zad14/lwy.png"
 output_path = "/home/mryduchowski1/obrazy repo/zestaw1/zad14/lwy_dithered.png"
 
+# Shared zestaw1 modules live one level above this task's folder
+sys.path.append(os.path.dirname(os.path.dirname(input_path)))
+from ordered import dither_1bit_rows
+from ij_pixels import gray_rows, gray_from_rows
+
 imp = IJ.openImage(input_path)
 if imp is None:
     print("Cannot open image: " + input_path)
@@ -21,19 +27,13 @@ else:
         [3, 0, 2],
         [4, 8, 6]
     ]
-    N = 3
-    M = N * N  # 9
     
     # === Apply ordered dithering ===
-    result_ip = ByteProcessor(width, height)
-    
-    for y in range(height):
-        for x in range(width):
-            pixel_val = float(ip.getPixel(x, y))
-            # Find threshold from D
-            threshold = ((float(D[y % N][x % N]) + 0.5) / float(M)) * 255.0
-            new_val = 255 if pixel_val > threshold else 0
-            result_ip.putPixel(x, y, new_val)
+    # Thresholds ((D + 0.5) / 9) * 255 are tiled to the image width once;
+    # each row is then a single comparison against its threshold row.
+    # Rows are sliced from the source byte[] and copied into the output byte[]
+    rows = dither_1bit_rows(gray_rows(ip), width, D)
+    result_ip = gray_from_rows(rows, width, height)
     
     # === Save result ===
     result_imp = ImagePlus("Dithered", result_ip)
@@ -1,5 +1,6 @@
+import os
+import sys
 from ij import IJ, ImagePlus
-from ij.process import ByteProcessor
 
 # Algorytm Ordered Dithering z macierzą Bayera 4x4
 # Kwantyzacja do 5 poziomów szarości: 0, 64, 128, 192, 255
@@ -8,13 +9,13 @@ from ij.process import ByteProcessor
 input_path = "/home/mryduchowski1/obrazy repo/zestaw1/zad15/lwy.png"
 output_path = "/home/mryduchowski1/obrazy repo/zestaw1/zad15/lwy_dithered_5levels.png"
 
-# Macierz Bayera 4x4
-bayer = [
-    [0,  8,  2, 10],
-    [12, 4, 14, 6],
-    [3, 11, 1, 9],
-    [15, 7, 13, 5]
-]
+# Wspólne moduły zestawu 1 (katalog nadrzędny względem zad15)
+sys.path.append(os.path.dirname(os.path.dirname(input_path)))
+from ordered import bayer_matrix, dither_levels_rows
+from ij_pixels import gray_rows, gray_from_rows
+
+# Macierz Bayera 4x4 (dowolny rząd 2^n: bayer_matrix(2), (8), ...)
+bayer = bayer_matrix(4)
 
 # 5 poziomów szarości
 gray_levels = [0, 64, 128, 192, 255]
@@ -40,40 +41,17 @@ else:
     
     print("\nRozmiar obrazu: " + str(width) + "x" + str(height))
     
-    # Przygotuj obraz wyjściowy
-    result_ip = ByteProcessor(width, height)
-    
     print("\n=== ALGORYTM ===")
     print("1. Normalizuj wartość piksela: norm = pixel / 255.0")
-    print("2. Pobierz próg z macierzy Bayera: t = (bayer[y%4][x%4] + 0.5) / 16.0")
+    print("2. Pobierz próg z macierzy Bayera: t = (bayer[y%4][x%4] + 0.5) / 16.0 (powielony na wiersz)")
     print("3. Zastosuj próg zmienny: val = floor((norm + t / (n_levels-1)) * (n_levels-1))")
     print("4. Przypisz poziom szarości: output = gray_levels[val]")
     print("\nPrzetwarzanie...")
     
-    # Przetwarzaj każdy piksel
-    for y in range(height):
-        for x in range(width):
-            # Pobierz wartość piksela i znormalizuj do 0-1
-            pixel_val = float(ip.getPixel(x, y))
-            norm = pixel_val / 255.0
-            
-            # Pobierz próg z macierzy Bayera (tile repeating)
-            bayer_val = float(bayer[y % 4][x % 4])
-            t = (bayer_val + 0.5) / 16.0
-            
-            # Zastosuj próg zmienny i skaluj
-            val = (norm + t / float(n_levels - 1)) * float(n_levels - 1)
-            val = int(val)  # floor
-            
-            # Ogranicz do zakresu 0 - (n_levels-1)
-            if val < 0:
-                val = 0
-            if val >= n_levels:
-                val = n_levels - 1
-            
-            # Przypisz odpowiedni poziom szarości
-            output_val = gray_levels[val]
-            result_ip.putPixel(x, y, output_val)
+    # Wiersze jako wycinki byte[] z getPixels(), wynik kopiowany wierszami
+    # do byte[] nowego obrazu; w pętli zostaje tylko odczyt z tablicy poziomów
+    rows = dither_levels_rows(gray_rows(ip), width, bayer, gray_levels)
+    result_ip = gray_from_rows(rows, width, height)
     
     # Zapisz wynik
     result_imp = ImagePlus("Dithered_5levels", result_ip)
@@ -82,14 +60,9 @@ else:
     
     # Statystyki
     print("\n=== STATYSTYKI ===")
-    level_counts = [0] * n_levels
-    for y in range(height):
-        for x in range(width):
-            val = result_ip.getPixel(x, y)
-            for i, level in enumerate(gray_levels):
-                if val == level:
-                    level_counts[i] += 1
-                    break
+    # Histogram obrazu wynikowego liczy ImageJ w jednym przejściu
+    hist = result_ip.getHistogram()
+    level_counts = [hist[level] for level in gray_levels]
     
     total_pixels = width * height
     print("Liczba pikseli na poziom:")
@@ -1,5 +1,6 @@
+import os
+import sys
 from ij import IJ, ImagePlus
-from ij.process import ColorProcessor
 from java.lang import Math
 
 # Full paths to input and output files
@@ -7,6 +8,10 @@ input_path = "/home/mryduchowski1/obrazy repo/zestaw1/zad9/potworek_pixelart.png
 output_path = "/home/mryduchowski1/obrazy repo/zestaw1/zad9/potworek_pixelart_scaled.png"
 target_width, target_height = 500, 650
 
+# Shared zestaw1 modules live one level above this task's folder
+sys.path.append(os.path.dirname(os.path.dirname(input_path)))
+from ij_pixels import get_rgb, new_rgb
+
 def custom_interpolate(pixels, w_in, h_in, new_w, new_h):
     result = [0] * (new_w * new_h)
     scale_x = float(w_in) / new_w
@@ -47,35 +52,16 @@ else:
     w_in = ip.getWidth()
     h_in = ip.getHeight()
     
-    # Get pixel array directly from ColorProcessor
-    pixels_in = ip.getPixels()
-    
-    # Extract RGB channels from packed int pixels
-    r_pixels = [0] * (w_in * h_in)
-    g_pixels = [0] * (w_in * h_in)
-    b_pixels = [0] * (w_in * h_in)
-    
-    for i in range(len(pixels_in)):
-        rgb = pixels_in[i]
-        r_pixels[i] = (rgb >> 16) & 0xff
-        g_pixels[i] = (rgb >> 8) & 0xff
-        b_pixels[i] = rgb & 0xff
+    # Split the packed RGB pixels into channels in one bulk transfer
+    r_pixels, g_pixels, b_pixels = get_rgb(ip)
     
     # Scale each channel using custom interpolation
     r_scaled = custom_interpolate(r_pixels, w_in, h_in, target_width, target_height)
     g_scaled = custom_interpolate(g_pixels, w_in, h_in, target_width, target_height)
     b_scaled = custom_interpolate(b_pixels, w_in, h_in, target_width, target_height)
     
-    # Create ColorProcessor and set pixels directly
-    cp = ColorProcessor(target_width, target_height)
-    for i in range(len(r_scaled)):
-        r_val = r_scaled[i]
-        g_val = g_scaled[i]
-        b_val = b_scaled[i]
-        rgb = ((r_val & 0xff) << 16) | ((g_val & 0xff) << 8) | (b_val & 0xff)
-        x = i % target_width
-        y = i / target_width
-        cp.putPixel(x, y, rgb)
+    # Merge the channels into a new ColorProcessor in one bulk transfer
+    cp = new_rgb(target_width, target_height, r_scaled, g_scaled, b_scaled)
     
     # Save result
     result_imp = ImagePlus("Scaled", cp)
@@ -6,6 +6,8 @@ Zadanie 1c (Jython/ImageJ): Próbkowanie obrazu z częstotliwością f_min i rek
 - Wyjścia: zestaw2/zad1/PlytkaFresnela-fmin.png (rekonstrukcja)
            zestaw2/zad1/PlytkaFresnela-fmin-side-by-side.png (porównanie)
 """
+import os
+import sys
 from ij import IJ, ImagePlus
 from ij.process import ByteProcessor
 from ij.process import Blitter
@@ -15,6 +17,10 @@ input_path = "/home/mryduchowski1/obrazy repo/zestaw2/zad1/PlytkaFresnela.png"
 output_path = "/home/mryduchowski1/obrazy repo/zestaw2/zad1/PlytkaFresnela-fmin.png"
 side_by_side_path = "/home/mryduchowski1/obrazy repo/zestaw2/zad1/PlytkaFresnela-fmin-side-by-side.png"
 
+# Wspólny moduł hurtowego przenoszenia pikseli (zestaw1/ij_pixels.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(input_path))), "zestaw1"))
+from ij_pixels import gray_from_rows
+
 # f_min = 1/step
 f_min = 1.0/20.0
 step = int(round(1.0 / f_min))  # 20
@@ -30,6 +36,9 @@ else:
     ip = imp.getProcessor()
     w = ip.getWidth()
     h = ip.getHeight()
+    # Tablica byte[] obrazu jednym wywołaniem (zamiast getPixel dla każdej
+    # próbki); odczytywane są z niej tylko próbki
+    pixels = ip.getPixels()
 
     # Rozmiar siatki próbkowania (ceiling dla brzegów)
     sample_w = (w + step - 1) // step
@@ -45,19 +54,14 @@ else:
             x_src = xs * step
             if x_src >= w:
                 x_src = w - 1
-            sample[ys][xs] = ip.getPixel(x_src, y_src)
+            sample[ys][xs] = pixels[y_src * w + x_src] & 0xff
 
     # 2) REKONSTRUKCJA: replikacja pikseli siatki do rozmiaru oryginału
-    out_ip = ByteProcessor(w, h)
-    for y in range(h):
-        ys = y // step
-        if ys >= sample_h:
-            ys = sample_h - 1
-        for x in range(w):
-            xs = x // step
-            if xs >= sample_w:
-                xs = sample_w - 1
-            out_ip.putPixel(x, y, sample[ys][xs])
+    #    (indeksy kolumn siatki liczone raz, wiersz wyjścia to ich odczyt)
+    #    i od razu kopiowany do byte[] obrazu wynikowego
+    columns = [min(x // step, sample_w - 1) for x in range(w)]
+    out_rows = ([sample[min(y // step, sample_h - 1)][xs] for xs in columns] for y in range(h))
+    out_ip = gray_from_rows(out_rows, w, h)
 
     # Zapis wyniku
     out_imp = ImagePlus("PlytkaFresnela-fmin", out_ip)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Piramida obrazu z filtrem antyaliasingowym do porównań z próbkowaniem
+punktowym (1c.py, sampling.py).
+
+Każdy poziom to zmniejszenie poprzedniego dwukrotnie w obu osiach po
+filtracji dolnoprzepustowej: 'box' (średnia 2×2), 'gaussian' (σ = 1 px
+poziomu wejściowego) lub 'lanczos' (Lanczos-3 o połowie pasma, pełny
+nośnik ±6 pikseli wejścia, jak przy zmniejszaniu w resample.py). Filtry
+są rozdzielne, o parzystej liczbie współczynników, wyśrodkowane między
+pikselami (piksel i poziomu k+1 leży w 2i + 0.5 poziomu k), brzegi
+powielane; dla nieparzystego rozmiaru poziom ma (n + 1) // 2 pikseli.
+
+Wszystkie poziomy (oktawy 1, 2, ...) leżą w jednym ciągłym buforze
+float32, a levels to widoki do niego. Budowa to jedno przejście po
+źródle pasami wierszy: każdy nowy pas źródła od razu przepychany jest
+kaskadowo przez kolejne poziomy (poziom k+1 liczony z gotowych wierszy
+poziomu k, a nie od nowa z pełnej rozdzielczości), więc źródło może być
+np. np.memmap czytanym tylko raz.
+"""
+
+import numpy as np
+
+# Połowa długości filtra (liczba współczynników po jednej stronie środka)
+_HALF_TAPS = {'box': 1, 'gaussian': 3, 'lanczos': 6}
+
+
+def filter_weights(name):
+    """Współczynniki filtra dla odległości ±0.5, ±1.5, ... od środka piksela wyjściowego."""
+    if name not in _HALF_TAPS:
+        raise ValueError(f'Nieznany filtr: {name} (dostępne: {", ".join(sorted(_HALF_TAPS))})')
+    half = _HALF_TAPS[name]
+    d = np.arange(-half, half) + 0.5
+    if name == 'box':
+        w = np.ones_like(d)
+    elif name == 'gaussian':
+        w = np.exp(-d * d / 2.0)
+    else:
+        # Lanczos-3 rozciągnięty dwukrotnie (połowa pasma poziomu wejściowego):
+        # nośnik ±6 pikseli wejścia, 12 współczynników
+        w = np.sinc(d / 2.0) * np.sinc(d / 6.0)
+    return d, w / w.sum()
+
+
+def level_shapes(shape, max_levels=None, min_size=1):
+    """Kształty kolejnych oktaw (bez poziomu 0), dopóki krótszy bok >= min_size."""
+    h, w = shape[:2]
+    shapes = []
+    while (max_levels is None or len(shapes) < max_levels) and min(h, w) > min_size:
+        h, w = (h + 1) // 2, (w + 1) // 2
+        if min(h, w) < min_size:
+            break
+        shapes.append((h, w) + tuple(shape[2:]))
+    return shapes
+
+
+class Pyramid(object):
+    """Poziomy piramidy: levels[0] to źródło, levels[k] (k >= 1) - widoki do buffer."""
+
+    def __init__(self, source, shapes, filter_name):
+        self.filter = filter_name
+        sizes = [int(np.prod(s)) for s in shapes]
+        self.buffer = np.empty(sum(sizes), dtype=np.float32)
+        self.levels = [source]
+        offset = 0
+        for shape, size in zip(shapes, sizes):
+            self.levels.append(self.buffer[offset:offset + size].reshape(shape))
+            offset += size
+
+    def __len__(self):
+        return len(self.levels)
+
+    def level(self, k):
+        return self.levels[k]
+
+    def as_uint8(self, k):
+        """Poziom k zaokrąglony do uint8."""
+        level = self.levels[k]
+        if level.dtype == np.uint8:
+            return level
+        return np.clip(np.rint(level), 0, 255).astype(np.uint8)
+
+    def for_factor(self, factor):
+        """Poziom dla zmniejszenia o czynnik będący potęgą dwójki (1, 2, 4, ...)."""
+        k = int(factor).bit_length() - 1
+        if factor < 1 or 1 << k != factor:
+            raise ValueError(f'Czynnik musi być potęgą dwójki: {factor}')
+        if k >= len(self.levels):
+            raise ValueError(f'Piramida ma tylko {len(self.levels) - 1} oktaw (czynnik {factor})')
+        return self.levels[k]
+
+
+def _axis_taps(n_in, n_out, offsets):
+    """Indeksy (n_out, taps) wejścia dla filtra wyśrodkowanego w 2i + 0.5, z powielaniem brzegów."""
+    centers = 2 * np.arange(n_out) + 0.5
+    return np.clip((centers[:, None] + offsets[None, :]).astype(np.intp), 0, n_in - 1)
+
+
+def _needed_rows(y_stop, half):
+    """Liczba wierszy wejścia potrzebnych do policzenia wierszy wyjścia [0, y_stop)."""
+    return 2 * (y_stop - 1) + half + 1
+
+
+def build_pyramid(source, filter_name='gaussian', max_levels=None, min_size=1, strip_rows=64):
+    """
+    Piramida obrazu (H, W) lub (H, W, C) w jednym przejściu po source
+    (pasami po strip_rows wierszy).
+    """
+    offsets, weights = filter_weights(filter_name)
+    half = _HALF_TAPS[filter_name]
+    pyramid = Pyramid(source, level_shapes(source.shape, max_levels, min_size), filter_name)
+    levels = pyramid.levels
+    n = len(levels)
+    # Tablice indeksów każdej oktawy liczone raz
+    row_taps = [None] + [_axis_taps(levels[k - 1].shape[0], levels[k].shape[0], offsets)
+                         for k in range(1, n)]
+    col_taps = [None] + [_axis_taps(levels[k - 1].shape[1], levels[k].shape[1], offsets)
+                         for k in range(1, n)]
+    ready = [0] * n  # liczba gotowych wierszy każdego poziomu
+
+    def advance(k):
+        """Policz wszystkie wiersze poziomu k, na które pozwalają gotowe wiersze poziomu k-1."""
+        src, dst = levels[k - 1], levels[k]
+        h_in, h_out = src.shape[0], dst.shape[0]
+        y = ready[k]
+        y_stop = y
+        while y_stop < h_out and (ready[k - 1] == h_in or
+                                  _needed_rows(y_stop + 1, half) <= ready[k - 1]):
+            y_stop += 1
+        if y_stop == y:
+            return
+        rows_idx = row_taps[k][y:y_stop]
+        lo = int(rows_idx.min())
+        block = np.asarray(src[lo:int(rows_idx.max()) + 1], dtype=np.float32)
+        vertical = sum(weights[t] * block[rows_idx[:, t] - lo] for t in range(len(weights)))
+        cols_idx = col_taps[k]
+        dst[y:y_stop] = sum(weights[t] * vertical[:, cols_idx[:, t]] for t in range(len(weights)))
+        ready[k] = y_stop
+
+    h = source.shape[0]
+    for start in range(0, h, strip_rows):
+        ready[0] = min(h, start + strip_rows)
+        for k in range(1, n):
+            advance(k)
+    return pyramid
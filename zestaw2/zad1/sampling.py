@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zadanie 1 (NumPy): próbkowanie obrazu i rekonstrukcja bez interpolacji
+dla wielu częstotliwości próbkowania w jednym przebiegu.
+
+To samo co 1c.py (ImageJ), ale na tablicach:
+- próbkowanie co step-ty piksel to wycinek z krokiem img[::step, ::step]
+  (widok, bez kopiowania),
+- rekonstrukcja (zero-order hold, replikacja próbek) to rozgłoszenie
+  siatki próbek na bloki step×step i jedno przepisanie do wyniku,
+- porównanie obok siebie składane z tablic (np.concatenate) zamiast
+  copyBits.
+Obraz wejściowy dekodowany jest raz i używany dla wszystkich kroków.
+Wynik dla step=20 jest identyczny z PlytkaFresnela-fmin.png z 1c.py.
+
+Z --prefilter box|gaussian|lanczos kroki będące potęgą dwójki są też
+próbkowane z filtrem antyaliasingowym (poziom piramidy z pyramid.py,
+zbudowanej raz dla wszystkich kroków) i porównywane z próbkowaniem
+punktowym (kolumna MSE z filtrem).
+
+Użycie:
+    python3 sampling.py                               # PlytkaFresnela.png, step 20
+    python3 sampling.py obraz.png --steps 2-40 --out-dir out --side-by-side
+    python3 sampling.py --steps 2,4,8,16,32 --prefilter lanczos
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+from PIL import ImageDraw
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pixel_views import load_image, image_view
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pyramid import build_pyramid
+
+
+def decimate(img, step):
+    """Co step-ty piksel w obu osiach (siatka ceil(h/step) × ceil(w/step)), jako widok."""
+    return img[::step, ::step]
+
+
+def reconstruct(samples, step, shape):
+    """Replikacja każdej próbki na blok step×step, przycięta do kształtu shape (h, w)."""
+    sh, sw = samples.shape
+    blocks = np.broadcast_to(samples[:, None, :, None], (sh, step, sw, step))
+    return blocks.reshape(sh * step, sw * step)[:shape[0], :shape[1]]
+
+
+def side_by_side(original, reconstruction, pad=40, labels=None):
+    """
+    Oryginał i rekonstrukcja obok siebie, pod białym marginesem pad
+    (na podpisy), złożone z tablic; labels - opcjonalne (lewy, prawy) podpis.
+    """
+    h, w = original.shape
+    body = np.concatenate([original, reconstruction], axis=1)
+    canvas = np.concatenate([np.full((pad, 2 * w), 255, dtype=np.uint8), body], axis=0)
+    if labels is not None:
+        img = image_view(canvas)
+        draw = ImageDraw.Draw(img)
+        draw.text((10, 10), labels[0], fill=0)
+        draw.text((w + 10, 10), labels[1], fill=0)
+        canvas = np.asarray(img)
+    return canvas
+
+
+def mse(a, b):
+    """Błąd średniokwadratowy rekonstrukcji."""
+    diff = a.astype(np.float64) - b
+    return float(np.mean(diff * diff))
+
+
+def sweep(img, steps):
+    """Generator (step, siatka próbek, rekonstrukcja) dla kolejnych kroków, z jednego obrazu."""
+    for step in steps:
+        samples = decimate(img, step)
+        yield step, samples, reconstruct(samples, step, img.shape)
+
+
+def prefiltered_sweep(img, steps, filter_name):
+    """
+    Generator (step, siatka próbek, rekonstrukcja) dla kroków będących potęgą
+    dwójki, z poziomów jednej piramidy z filtrem filter_name; inne kroki pomijane.
+    """
+    octaves = [s.bit_length() - 1 for s in steps if s & (s - 1) == 0]
+    if not octaves:
+        return
+    pyramid = build_pyramid(img, filter_name, max_levels=max(octaves))
+    for step in steps:
+        k = step.bit_length() - 1
+        if step & (step - 1) == 0 and k < len(pyramid):
+            samples = pyramid.as_uint8(k)
+            yield step, samples, reconstruct(samples, step, img.shape)
+
+
+def parse_steps(text):
+    """'20', '2-40', '2-40:2' albo '5,10,20' -> lista kroków."""
+    steps = []
+    for part in text.split(','):
+        if '-' in part:
+            span, _, stride = part.partition(':')
+            lo, hi = [int(v) for v in span.split('-')]
+            steps.extend(range(lo, hi + 1, int(stride or 1)))
+        else:
+            steps.append(int(part))
+    if any(s < 1 for s in steps):
+        raise ValueError(f'Krok próbkowania musi być >= 1: {text}')
+    return steps
+
+
+def main(argv=None):
+    base = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='Próbkowanie i rekonstrukcja dla wielu kroków')
+    parser.add_argument('input', nargs='?', default=os.path.join(base, 'PlytkaFresnela.png'))
+    parser.add_argument('--steps', default='20', help="np. '20', '2-40', '2-40:2', '5,10,20'")
+    parser.add_argument('--out-dir', default=base)
+    parser.add_argument('--side-by-side', action='store_true', help='zapisz też porównania obok siebie')
+    parser.add_argument('--prefilter', choices=('box', 'gaussian', 'lanczos'),
+                        help='porównaj z próbkowaniem z filtrem antyaliasingowym (kroki 2^k)')
+    args = parser.parse_args(argv)
+
+    img = load_image(args.input, 'L')
+    name = os.path.splitext(os.path.basename(args.input))[0]
+    os.makedirs(args.out_dir, exist_ok=True)
+    steps = parse_steps(args.steps)
+    single = len(steps) == 1
+
+    print(f'Wejście: {args.input} ({img.shape[1]}x{img.shape[0]})')
+    filtered = {}
+    if args.prefilter:
+        for step, samples, recon in prefiltered_sweep(img, steps, args.prefilter):
+            image_view(np.ascontiguousarray(recon)).save(
+                os.path.join(args.out_dir, f'{name}-step{step}-{args.prefilter}.png'))
+            filtered[step] = mse(img, recon)
+    header = f'{"step":>5} {"f":>9} {"siatka":>11} {"MSE":>10}'
+    if args.prefilter:
+        header += f' {"MSE " + args.prefilter:>14}'
+    print(header)
+    for step, samples, recon in sweep(img, steps):
+        suffix = '-fmin' if single else f'-step{step}'
+        image_view(np.ascontiguousarray(recon)).save(os.path.join(args.out_dir, name + suffix + '.png'))
+        if args.side_by_side:
+            labels = ('oryginał', f'rekonstrukcja (step={step})')
+            image_view(side_by_side(img, recon, labels=labels)).save(
+                os.path.join(args.out_dir, name + suffix + '-side-by-side.png'))
+        grid = f'{samples.shape[1]}x{samples.shape[0]}'
+        line = f'{step:>5} {1.0 / step:>9.5f} {grid:>11} {mse(img, recon):>10.2f}'
+        if args.prefilter:
+            line += f' {filtered[step]:>14.2f}' if step in filtered else f' {"-":>14}'
+        print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,10 +14,12 @@ import sys
 import numpy as np
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pixel_views import load_image
+
 
 def load_gray(path):
-    img = Image.open(path).convert('L')
-    return np.asarray(img, dtype=np.float32)
+    return load_image(path, 'L', np.float32)
 
 
 def save_gray(arr, path, normalize=True):
@@ -20,10 +20,13 @@ from typing import Tuple
 import numpy as np
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pixel_views import load_image, image_view
+from normalize import percentiles, to_uint8
+
 
 def load_gray(path: str) -> np.ndarray:
-    img = Image.open(path).convert('L')
-    return np.asarray(img, dtype=np.float32)
+    return load_image(path, 'L', np.float32)
 
 
 def global_contrast_michelson(gray: np.ndarray) -> float:
@@ -97,17 +100,13 @@ def to_uint8_image(arr: np.ndarray, mode: str = 'abs') -> Image.Image:
     """
     a = np.asarray(arr, dtype=np.float32)
     if mode == 'pos':
-        a = np.clip(a, 0.0, 1.0)
-        a = (a * 255.0).astype(np.uint8)
-        return Image.fromarray(a, mode='L')
+        return image_view(to_uint8(a, 0.0, 1.0))
     # abs mode
     v = np.abs(a)
-    p1, p99 = np.percentile(v, [1, 99])
+    p1, p99 = percentiles(v, (1, 99))
     if p99 <= p1 + 1e-9:
         p1, p99 = 0.0, float(np.max(v) or 1.0)
-    v = np.clip((v - p1) / max(p99 - p1, 1e-6), 0.0, 1.0)
-    v = (v * 255.0).astype(np.uint8)
-    return Image.fromarray(v, mode='L')
+    return image_view(to_uint8(v, p1, p99, scratch=np.empty(v.shape)))
 
 
 def analyze_image(path: str, out_dir: str) -> None:
@@ -9,28 +9,425 @@ Liczymy MSE dla obrazów RGB:
 - MSE_avg = (MSE_R + MSE_G + MSE_B) / 3
 
 Dodatkowo zapisujemy mapy błędu (różnica) dla wizualizacji.
+
+Miary liczone są strumieniowo (QualityStats, compare_files): oba obrazy
+czytane pasami po chunk_rows wierszy jako uint8 (PNG dekodowany wiersz
+po wierszu, .npy i surowe pliki przez np.memmap), a sumy kwadratów błędów
+i błąd maksymalny zbierane w int64 osobno dla kanałów - pamięć O(pasa),
+więc porównanie wzorców o setkach megapikseli nie wymaga wczytania
+całości. Poza MSE raportowane są PSNR i maksymalny błąd.
+
+SSIM i MS-SSIM (--ssim, --ms-ssim) liczone są w tym samym przebiegu
+pasami: lokalne średnie, wariancje i kowariancja z rozdzielnego okna
+Gaussa 11×11 (σ = 1.5, tylko pełne okna, jak u Wanga i in.) w float32,
+z zakładką 10 wierszy między pasami. MS-SSIM używa 5 skal (wagi Wanga,
+zmniejszanie średnią 2×2), a każda skala dostaje wiersze od poprzedniej
+na bieżąco, więc też wystarcza pamięć O(pasa). --luma liczy SSIM tylko
+na luminancji (Y = 0.299 R + 0.587 G + 0.114 B) zamiast na trzech kanałach.
+Filtracja przez scipy.ndimage, jeśli jest zainstalowane (import dopiero
+przy pierwszym SSIM), w przeciwnym razie na wycinkach NumPy.
+
+Tryb wsadowy (batch_compare): wzorzec dekodowany jest raz (albo
+odwzorowany w pamięci), a dowolnie wiele kandydatów (np. różne jakości
+JPEG, palety GIF) ocenianych jest równolegle w puli wątków lub procesów
+(--jobs, --executor); wyniki trafiają do raportu JSON lub CSV (--report).
+Przy jednym kandydacie oba obrazy czytane są strumieniowo.
+
+Mapy błędu wymagają całych obrazów w pamięci, więc dla kandydatów
+podanych w linii poleceń zapisywane są tylko na żądanie (--visuals),
+do katalogu --visuals-dir, pod nazwą pliku kandydata (bez rozszerzenia).
+
+Użycie:
+    python3 mse.py                                  # osaRGB_PNG vs GIF, JPG
+    python3 mse.py wzorzec.png kopia1.png kopia2.npy --chunk-rows 512
+    python3 mse.py wzorzec.png q*.jpg -j 0 --report wyniki.csv
+    python3 mse.py wzorzec.png kopia.jpg --visuals --visuals-dir mapy
 """
+import argparse
+import csv
+import json
+import math
 import os
 import sys
-from typing import Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
 import numpy as np
-from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pixel_views import load_image, image_view
+from normalize import percentiles, to_uint8
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'zestaw1'))
+from stream_resample import ArrayRows, open_source
+
+# Wiersze czytane naraz z każdego obrazu
+CHUNK_ROWS = 256
 
 
 def load_rgb(path: str) -> np.ndarray:
-    img = Image.open(path).convert('RGB')
-    return np.asarray(img, dtype=np.float32)
+    return load_image(path, 'RGB', np.float32)
+
+
+def psnr(mse: float, peak: float = 255.0) -> float:
+    """PSNR w dB dla danego MSE (inf dla obrazów identycznych)."""
+    if mse == 0:
+        return math.inf
+    return 10.0 * math.log10(peak * peak / mse)
+
+
+# === SSIM / MS-SSIM ===
+
+SSIM_WINDOW = 11
+SSIM_SIGMA = 1.5
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+# Wagi skal MS-SSIM (Wang, Simoncelli, Bovik 2003)
+MS_SSIM_WEIGHTS = (0.0448, 0.2856, 0.3001, 0.2363, 0.1333)
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def _gaussian_window(size: int = SSIM_WINDOW, sigma: float = SSIM_SIGMA) -> np.ndarray:
+    d = np.arange(size, dtype=np.float64) - (size - 1) / 2.0
+    w = np.exp(-d * d / (2.0 * sigma * sigma))
+    return (w / w.sum()).astype(np.float32)
+
+
+_WINDOW = _gaussian_window()
+
+
+_correlate1d = None
+
+
+def _try_correlate1d():
+    """scipy.ndimage.correlate1d, jeśli SciPy jest dostępne (importowane dopiero przy pierwszym SSIM)."""
+    global _correlate1d
+    if _correlate1d is None:
+        try:
+            from scipy.ndimage import correlate1d
+            _correlate1d = correlate1d
+        except Exception:
+            _correlate1d = False
+    return _correlate1d
+
+
+def _filter_axis(stack: np.ndarray, axis: int) -> np.ndarray:
+    """Okno Gaussa wzdłuż osi axis, tylko pełne okna (wynik krótszy o SSIM_WINDOW - 1)."""
+    n = len(_WINDOW)
+    half = n // 2
+    length = stack.shape[axis] - n + 1
+
+    def part(t, source=stack):
+        index = [slice(None)] * source.ndim
+        index[axis] = slice(t, t + length)
+        return source[tuple(index)]
+    correlate1d = _try_correlate1d()
+    if correlate1d:
+        return part(half, correlate1d(stack, _WINDOW, axis=axis, mode='nearest'))
+    # Okno symetryczne: pary współczynników t i n-1-t, sumy w miejscu
+    out = _WINDOW[half] * part(half)
+    for t in range(half):
+        pair = part(t) + part(n - 1 - t)
+        pair *= _WINDOW[t]
+        out += pair
+    return out
+
+
+def _filter_valid(stack: np.ndarray) -> np.ndarray:
+    """Rozdzielne okno Gaussa (tylko pełne okna) na osiach wierszy i kolumn stosu (K, H, W, C)."""
+    return _filter_axis(_filter_axis(stack, 1), 2)
+
+
+def ssim_maps(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Mapy SSIM i składnika kontrast-struktura (cs) dla float32 (H, W, C), bez brzegów okna."""
+    mu_x, mu_y, xx, yy, xy = _filter_valid(np.stack([x, y, x * x, y * y, x * y]))
+    mu_xx, mu_yy, mu_xy = mu_x * mu_x, mu_y * mu_y, mu_x * mu_y
+    cs = (2.0 * (xy - mu_xy) + SSIM_C2) / ((xx - mu_xx) + (yy - mu_yy) + SSIM_C2)
+    luminance = (2.0 * mu_xy + SSIM_C1) / (mu_xx + mu_yy + SSIM_C1)
+    return luminance * cs, cs
+
+
+class _SsimScale:
+    """
+    Jedna skala SSIM liczona pasami: trzyma ostatnie SSIM_WINDOW - 1 wierszy
+    (zakładka do następnego pasa) i przekazuje wiersze zmniejszone średnią 2×2
+    do następnej skali.
+    """
+
+    def __init__(self, channels: int, next_scale: Optional['_SsimScale'] = None):
+        self.pending = None
+        self.odd = None
+        self.ssim_sum = np.zeros(channels)
+        self.cs_sum = np.zeros(channels)
+        self.count = 0
+        self.next = next_scale
+
+    def push(self, x: np.ndarray, y: np.ndarray) -> None:
+        pair = np.stack([x, y])
+        if self.next is not None:
+            self._forward(pair)
+        if self.pending is not None:
+            pair = np.concatenate([self.pending, pair], axis=1)
+        if pair.shape[1] >= SSIM_WINDOW and pair.shape[2] >= SSIM_WINDOW:
+            ssim, cs = ssim_maps(pair[0], pair[1])
+            self.ssim_sum += ssim.sum(axis=(0, 1), dtype=np.float64)
+            self.cs_sum += cs.sum(axis=(0, 1), dtype=np.float64)
+            self.count += ssim.shape[0] * ssim.shape[1]
+        self.pending = pair[:, -(SSIM_WINDOW - 1):]
+
+    def _forward(self, pair: np.ndarray) -> None:
+        if self.odd is not None:
+            pair = np.concatenate([self.odd, pair], axis=1)
+        rows = pair.shape[1] // 2 * 2
+        cols = pair.shape[2] // 2 * 2
+        self.odd = pair[:, rows:] if rows < pair.shape[1] else None
+        if rows:
+            k, _, _, c = pair.shape
+            blocks = pair[:, :rows, :cols].reshape(k, rows // 2, 2, cols // 2, 2, c)
+            half = blocks.mean(axis=(2, 4), dtype=np.float32)
+            self.next.push(half[0], half[1])
+
+    def means(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Średnie SSIM i cs osobno dla kanałów (nan, gdy skala mniejsza od okna)."""
+        if not self.count:
+            nan = np.full_like(self.ssim_sum, np.nan)
+            return nan, nan
+        return self.ssim_sum / self.count, self.cs_sum / self.count
+
+
+class SsimStats:
+    """SSIM (i opcjonalnie MS-SSIM) zbierane pasami uint8 (wiersze, W, 3)."""
+
+    def __init__(self, multiscale: bool = False, luma: bool = False):
+        self.luma = luma
+        channels = 1 if luma else 3
+        self.scales = [_SsimScale(channels)]
+        for _ in range(len(MS_SSIM_WEIGHTS) - 1 if multiscale else 0):
+            self.scales.insert(0, _SsimScale(channels, self.scales[0]))
+
+    def update(self, ref: np.ndarray, test: np.ndarray) -> None:
+        x = ref.astype(np.float32)
+        y = test.astype(np.float32)
+        if self.luma:
+            x = (x @ LUMA_WEIGHTS)[..., None]
+            y = (y @ LUMA_WEIGHTS)[..., None]
+        self.scales[0].push(x, y)
+
+    def ssim(self) -> float:
+        """Średnie SSIM (pełna rozdzielczość), uśrednione po kanałach."""
+        return float(np.mean(self.scales[0].means()[0]))
 
+    def ms_ssim(self) -> float:
+        """MS-SSIM: iloczyn cs^w z pierwszych skal i SSIM^w z ostatniej, uśredniony po kanałach."""
+        if len(self.scales) == 1:
+            return math.nan
+        values = np.ones_like(self.scales[0].ssim_sum)
+        for j, (scale, weight) in enumerate(zip(self.scales, MS_SSIM_WEIGHTS)):
+            ssim, cs = scale.means()
+            term = ssim if j == len(self.scales) - 1 else cs
+            values *= np.maximum(term, 0.0) ** weight
+        return float(np.mean(values))
 
-def mse_per_channel(ref: np.ndarray, test: np.ndarray) -> Tuple[float, float, float, float]:
+
+class QualityStats:
+    """Sumy kwadratów błędów, błąd maksymalny i liczba pikseli, zbierane pasami."""
+
+    def __init__(self, channels: int = 3, ssim: bool = False, ms_ssim: bool = False,
+                 luma: bool = False):
+        self.sse = np.zeros(channels, dtype=np.int64)
+        self.max_error = np.zeros(channels, dtype=np.int64)
+        self.pixels = 0
+        self.structural = SsimStats(ms_ssim, luma) if ssim or ms_ssim else None
+
+    def update(self, ref: np.ndarray, test: np.ndarray) -> None:
+        """Dolicz pas (wiersze, W, C) obu obrazów."""
+        if ref.shape != test.shape:
+            raise ValueError("Rozmiary obrazów nie zgadzają się: %s vs %s" % (ref.shape, test.shape))
+        if ref.dtype == np.uint8 and test.dtype == np.uint8:
+            diff = ref.astype(np.int32) - test
+            self.sse += (diff * diff).reshape(-1, diff.shape[-1]).sum(axis=0, dtype=np.int64)
+        else:
+            # Wejście zmiennoprzecinkowe (np. z load_rgb) - sumy w float64
+            diff = ref.astype(np.float64) - test
+            self.sse = self.sse + (diff * diff).reshape(-1, diff.shape[-1]).sum(axis=0)
+        err = np.abs(diff).reshape(-1, diff.shape[-1]).max(axis=0, initial=0)
+        self.max_error = np.maximum(self.max_error, err)
+        self.pixels += ref.shape[0] * ref.shape[1]
+        if self.structural is not None:
+            self.structural.update(ref, test)
+
+    def mse(self) -> Tuple[float, ...]:
+        """MSE osobno dla kanałów."""
+        return tuple(float(v) / self.pixels for v in self.sse)
+
+    def mse_avg(self) -> float:
+        values = self.mse()
+        return sum(values) / len(values)
+
+    def psnr(self) -> float:
+        """PSNR dla średniego MSE kanałów."""
+        return psnr(self.mse_avg())
+
+    def ssim(self) -> Optional[float]:
+        return None if self.structural is None else self.structural.ssim()
+
+    def ms_ssim(self) -> Optional[float]:
+        if self.structural is None or len(self.structural.scales) == 1:
+            return None
+        return self.structural.ms_ssim()
+
+
+def _rgb_rows(rows: np.ndarray) -> np.ndarray:
+    """Pas w skali szarości, szarość+alfa, RGB lub RGBA jako (wiersze, W, 3), jak convert('RGB')."""
+    if rows.ndim == 2:
+        rows = rows[..., None]
+    if rows.shape[2] in (1, 2):
+        return np.repeat(rows[..., :1], 3, axis=2)
+    return rows[..., :3]
+
+
+def open_rows(path: str, shape: Optional[Sequence[int]] = None):
+    """
+    Źródło wierszy obrazu: PNG 8-bit bez palety dekodowany strumieniowo,
+    .npy i surowy uint8 (z shape) przez np.memmap; inne formaty (GIF, JPEG)
+    dekodowane raz do uint8. Używane w instrukcji with (zamyka plik PNG).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.npy', '.png') or shape is not None:
+        try:
+            return open_source(path, shape)
+        except ValueError:
+            if ext != '.png':
+                raise
+    return ArrayRows(load_image(path, 'RGB'))
+
+
+def compare_files(ref_path: str, test_path: str, chunk_rows: int = CHUNK_ROWS,
+                  shape: Optional[Sequence[int]] = None, **metrics) -> QualityStats:
+    """
+    Strumieniowe porównanie dwóch plików, pasami po chunk_rows wierszy;
+    metrics - opcje QualityStats (ssim, ms_ssim, luma).
+    """
+    with open_rows(ref_path, shape) as ref, open_rows(test_path, shape) as test:
+        return compare_sources(ref, test, chunk_rows, **metrics)
+
+
+def compare_sources(ref, test, chunk_rows: int = CHUNK_ROWS, **metrics) -> QualityStats:
+    """Porównanie dwóch źródeł wierszy (ArrayRows, PngRows), pasami po chunk_rows wierszy."""
+    if ref.shape[:2] != test.shape[:2]:
+        raise ValueError("Rozmiary obrazów nie zgadzają się: %s vs %s" % (ref.shape, test.shape))
+    stats = QualityStats(**metrics)
+    h = ref.shape[0]
+    for lo in range(0, h, chunk_rows):
+        hi = min(h, lo + chunk_rows)
+        stats.update(_rgb_rows(ref.rows(lo, hi)), _rgb_rows(test.rows(lo, hi)))
+    return stats
+
+
+# === Tryb wsadowy: jeden wzorzec, wielu kandydatów ===
+
+# Wzorzec w procesach roboczych (dziedziczony przy fork, wczytywany przy spawn)
+_worker_reference = None
+
+
+def load_reference(path: str, shape: Optional[Sequence[int]] = None) -> ArrayRows:
+    """
+    Wzorzec jako wiersze dostępne w dowolnej kolejności (współdzielone przez
+    wątki): .npy i surowy uint8 przez np.memmap, inne formaty dekodowane raz.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npy' or (shape is not None and ext != '.png'):
+        return open_source(path, shape)
+    return ArrayRows(load_image(path, 'RGB'))
+
+
+def _init_worker(ref_path: str, shape: Optional[Sequence[int]]) -> None:
+    global _worker_reference
+    if _worker_reference is None:
+        _worker_reference = load_reference(ref_path, shape)
+
+
+def evaluate_candidate(path: str, ref=None, chunk_rows: int = CHUNK_ROWS,
+                       shape: Optional[Sequence[int]] = None, **metrics) -> Dict[str, object]:
+    """Wiersz raportu dla jednego kandydata; błąd (np. inny rozmiar) zapisywany w polu 'error'."""
+    ref = _worker_reference if ref is None else ref
+    row = {'candidate': path, 'width': ref.shape[1], 'height': ref.shape[0]}
+    try:
+        with open_rows(path, shape) as test:
+            stats = compare_sources(ref, test, chunk_rows, **metrics)
+    except (OSError, ValueError) as e:
+        row['error'] = str(e)
+        return row
+    r, g, b = stats.mse()
+    row.update(mse_r=r, mse_g=g, mse_b=b, mse_avg=stats.mse_avg(), psnr=stats.psnr(),
+               max_error=int(stats.max_error.max()), ssim=stats.ssim(), ms_ssim=stats.ms_ssim(), error='')
+    return row
+
+
+def batch_compare(ref_path: str, candidates: Sequence[str], jobs: int = 1, executor: str = 'thread',
+                  chunk_rows: int = CHUNK_ROWS, shape: Optional[Sequence[int]] = None,
+                  **metrics) -> List[Dict[str, object]]:
+    """
+    Ocena kandydatów względem jednego wzorca (dekodowanego raz; dla jednego
+    kandydata czytanego strumieniowo, jak w compare_files), w kolejności
+    candidates. jobs - liczba wątków/procesów (0: wszystkie rdzenie, 1: bez puli);
+    executor - 'thread' (NumPy i dekodery PIL zwalniają GIL) albo 'process';
+    metrics - opcje QualityStats (ssim, ms_ssim, luma).
+    """
+    global _worker_reference
+    jobs = jobs or os.cpu_count() or 1
+    if len(candidates) == 1:
+        # Jeden kandydat: wzorzec też czytany strumieniowo (pamięć O(pasa))
+        with open_rows(ref_path, shape) as ref:
+            return [evaluate_candidate(candidates[0], ref, chunk_rows, shape, **metrics)]
+    ref = load_reference(ref_path, shape)
+    if jobs == 1:
+        return [evaluate_candidate(p, ref, chunk_rows, shape, **metrics) for p in candidates]
+    if executor == 'process':
+        _worker_reference = ref
+        evaluate = partial(evaluate_candidate, chunk_rows=chunk_rows, shape=shape, **metrics)
+        try:
+            with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(ref_path, shape)) as pool:
+                return list(pool.map(evaluate, candidates,
+                                     chunksize=max(1, len(candidates) // (4 * jobs))))
+        finally:
+            _worker_reference = None
+    evaluate = partial(evaluate_candidate, ref=ref, chunk_rows=chunk_rows, shape=shape, **metrics)
+    with ThreadPoolExecutor(jobs) as pool:
+        return list(pool.map(evaluate, candidates))
+
+
+REPORT_FIELDS = ('candidate', 'width', 'height', 'mse_r', 'mse_g', 'mse_b', 'mse_avg',
+                 'psnr', 'max_error', 'ssim', 'ms_ssim', 'error')
+
+
+def write_report(results: Sequence[Dict[str, object]], path: str, reference: str = '') -> None:
+    """
+    Raport .json (wzorzec + lista wyników; wartości nieskończone i nan - np. PSNR
+    identycznych obrazów, SSIM obrazów mniejszych od okna - jako null) albo .csv
+    (wiersz na kandydata).
+    """
+    if path.lower().endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        return
+    rows = [dict((k, None if isinstance(v, float) and not math.isfinite(v) else v) for k, v in r.items())
+            for r in results]
+    with open(path, 'w') as f:
+        json.dump({'reference': reference, 'results': rows}, f, indent=2, ensure_ascii=False,
+                  allow_nan=False)
+
+
+def mse_per_channel(ref: np.ndarray, test: np.ndarray,
+                    chunk_rows: int = CHUNK_ROWS) -> Tuple[float, float, float, float]:
     if ref.shape != test.shape:
         raise ValueError("Rozmiary obrazów nie zgadzają się: %s vs %s" % (ref.shape, test.shape))
-    diff = ref - test
-    se = diff * diff
-    # kanały
-    r = float(np.mean(se[..., 0]))
-    g = float(np.mean(se[..., 1]))
-    b = float(np.mean(se[..., 2]))
+    stats = QualityStats(ref.shape[2])
+    for lo in range(0, ref.shape[0], chunk_rows):
+        stats.update(ref[lo:lo + chunk_rows], test[lo:lo + chunk_rows])
+    r, g, b = stats.mse()
     avg = (r + g + b) / 3.0
     return r, g, b, avg
 
@@ -39,54 +436,93 @@ def save_error_visuals(ref: np.ndarray, test: np.ndarray, out_prefix: str) -> No
     diff = np.abs(ref - test)
     # mapa |diff| w luminancji (prosty average kanałów)
     lum = np.mean(diff, axis=2)
-    # skalowanie do 0..255 poprzez percentyle (robustnie)
-    p95 = np.percentile(lum, 95)
-    scale = 255.0 / max(p95, 1e-6)
-    vis = np.clip(lum * scale, 0, 255).astype(np.uint8)
-    Image.fromarray(vis, mode='L').save(out_prefix + '-diff-luma.png')
+    # skalowanie do 0..255 poprzez percentyle (robustnie); jeden bufor uint8
+    # i jeden pomocniczy dla wszystkich map
+    vis = np.empty(lum.shape, dtype=np.uint8)
+    to_uint8(lum, 0.0, percentiles(lum, 95), vis, scratch=lum)
+    image_view(vis).save(out_prefix + '-diff-luma.png')
 
     # per kanał heatmapa (po prostu diff skompresowany do 0..255)
     for i, ch in enumerate('RGB'):
         chd = diff[..., i]
-        p95c = np.percentile(chd, 95)
-        scalec = 255.0 / max(p95c, 1e-6)
-        visc = np.clip(chd * scalec, 0, 255).astype(np.uint8)
-        Image.fromarray(visc, mode='L').save(out_prefix + f'-diff-{ch}.png')
+        to_uint8(chd, 0.0, percentiles(chd, 95), vis, scratch=lum)
+        image_view(vis).save(out_prefix + f'-diff-{ch}.png')
+
 
+def _label(path: str) -> str:
+    """Krótka nazwa obrazu do raportu: osaRGB_gif.gif -> GIF."""
+    return os.path.splitext(os.path.basename(path))[0].split('_')[-1].upper()
 
-def main():
+
+def main(argv=None):
     base = os.path.dirname(os.path.abspath(__file__))
-    ref_path = os.path.join(base, 'osaRGB_PNG.png')
-    gif_path = os.path.join(base, 'osaRGB_gif.gif')
-    jpg_path = os.path.join(base, 'osaRGB_JPG.jpg')
+    parser = argparse.ArgumentParser(description='MSE / PSNR względem obrazu referencyjnego')
+    parser.add_argument('reference', nargs='?', default=os.path.join(base, 'osaRGB_PNG.png'))
+    parser.add_argument('candidates', nargs='*')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--shape', help='kształt surowych wejść: HxWxC')
+    parser.add_argument('--visuals', action='store_true', default=None,
+                        help='zapisz mapy błędu (wymagają całych obrazów; domyślnie tylko bez podanych kandydatów)')
+    parser.add_argument('--no-visuals', action='store_false', dest='visuals', help='bez map błędu')
+    parser.add_argument('--visuals-dir', default=base, help='katalog map błędu (domyślnie katalog skryptu)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='równoległe porównania (0: wszystkie rdzenie)')
+    parser.add_argument('--executor', choices=('thread', 'process'), default='thread')
+    parser.add_argument('--report', help='raport .json albo .csv')
+    parser.add_argument('--ssim', action='store_true', help='licz też SSIM')
+    parser.add_argument('--ms-ssim', action='store_true', help='licz też SSIM i MS-SSIM (5 skal)')
+    parser.add_argument('--luma', action='store_true', help='SSIM tylko na luminancji (szybciej)')
+    args = parser.parse_args(argv)
+    shape = [int(v) for v in args.shape.lower().split('x')] if args.shape else None
+    if args.visuals is None:
+        args.visuals = not args.candidates
+    if not args.candidates:
+        args.candidates = [os.path.join(base, 'osaRGB_gif.gif'), os.path.join(base, 'osaRGB_JPG.jpg')]
 
-    for p in [ref_path, gif_path, jpg_path]:
+    for p in [args.reference] + args.candidates:
         if not os.path.exists(p):
             print('Brak pliku:', p)
             return 1
 
-    ref = load_rgb(ref_path)
-    gif = load_rgb(gif_path)
-    jpg = load_rgb(jpg_path)
-
-    if ref.shape != gif.shape or ref.shape != jpg.shape:
-        print('Rozmiary obrazów są różne:', ref.shape, gif.shape, jpg.shape)
+    results = batch_compare(args.reference, args.candidates, args.jobs, args.executor,
+                            args.chunk_rows, shape, ssim=args.ssim, ms_ssim=args.ms_ssim, luma=args.luma)
+    if args.report:
+        write_report(results, args.report, args.reference)
+    failed = [r for r in results if r['error']]
+    for r in results:
+        label = _label(r['candidate'])
+        if r['error']:
+            print('%s: %s' % (label, r['error']))
+            continue
+        print('%s vs %s: MSE_R = %.2f, MSE_G = %.2f, MSE_B = %.2f, MSE_avg = %.2f, PSNR = %.2f dB, max = %d'
+              % (label, _label(args.reference), r['mse_r'], r['mse_g'], r['mse_b'], r['mse_avg'],
+                 r['psnr'], r['max_error']))
+        if r['ssim'] is not None:
+            line = '    SSIM%s = %.4f' % (' (Y)' if args.luma else '', r['ssim'])
+            if r['ms_ssim'] is not None:
+                line += ', MS-SSIM = %.4f' % r['ms_ssim']
+            print(line)
+    ranked = [(r['mse_avg'], _label(r['candidate']), r['candidate']) for r in results if not r['error']]
+    if not ranked:
         return 1
 
-    r_gif, g_gif, b_gif, avg_gif = mse_per_channel(ref, gif)
-    r_jpg, g_jpg, b_jpg, avg_jpg = mse_per_channel(ref, jpg)
-
-    print('GIF vs PNG: MSE_R = %.2f, MSE_G = %.2f, MSE_B = %.2f, MSE_avg = %.2f' % (r_gif, g_gif, b_gif, avg_gif))
-    print('JPG vs PNG: MSE_R = %.2f, MSE_G = %.2f, MSE_B = %.2f, MSE_avg = %.2f' % (r_jpg, g_jpg, b_jpg, avg_jpg))
-
     # Zapisy wizualizacji różnic
-    save_error_visuals(ref, gif, os.path.join(base, 'GIF'))
-    save_error_visuals(ref, jpg, os.path.join(base, 'JPG'))
+    if args.visuals:
+        os.makedirs(args.visuals_dir, exist_ok=True)
+        ref = load_rgb(args.reference)
+        for _, _, path in ranked:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            save_error_visuals(ref, load_rgb(path), os.path.join(args.visuals_dir, stem))
 
     # Który lepszy wg MSE
-    better = 'GIF' if avg_gif < avg_jpg else 'JPEG'
-    print('Lepszy wg MSE:', better)
-    return 0
+    best = min(ranked)[1]
+    print('Lepszy wg MSE:', 'JPEG' if best == 'JPG' else best)
+    # SSIM nan (obraz mniejszy od okna) nie bierze udziału w wyborze
+    scored = [(r['ssim'], _label(r['candidate'])) for r in results
+              if not r['error'] and r['ssim'] is not None and not math.isnan(r['ssim'])]
+    if scored:
+        best = max(scored)[1]
+        print('Lepszy wg SSIM:', 'JPEG' if best == 'JPG' else best)
+    return 1 if failed else 0
 
 
 if __name__ == '__main__':
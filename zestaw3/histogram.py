@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Wspólny moduł histogramów dla skryptów zestawu 3.
+
+- histogram liczony jednym przejściem przez np.bincount (zamiast 256 porównań),
+- obrazy 8-bitowe → 256 kubełków, 16-bitowe → 65536 kubełków,
+- histogram liczony raz można przekazać dalej (parametr hist funkcji
+  w point_ops i skryptach), więc wyrównanie, hiperbolizacja i wykresy
+  nie liczą go ponownie; moduł niczego nie zapamiętuje, więc zmiana
+  obrazu w miejscu nie daje nieaktualnego wyniku,
+- akumulacja po fragmentach (np. wierszach np.memmap) dla obrazów
+  większych niż pamięć operacyjna,
+- percentyle i statystyki (średnia, mediana, odchylenie) liczone
+  z histogramu zamiast z pełnej kopii obrazu.
+"""
+
+import numpy as np
+
+
+def histogram_bins(dtype):
+    """Liczba kubełków dla typu obrazu: 256 dla 8 bitów, 65536 dla 16 bitów."""
+    dtype = np.dtype(dtype)
+    if dtype == np.uint8:
+        return 256
+    if dtype == np.uint16:
+        return 65536
+    raise TypeError(f'Nieobsługiwany typ obrazu: {dtype} (oczekiwano uint8 lub uint16)')
+
+
+def accumulate_histogram(chunks, bins=256):
+    """Zsumuj histogramy kolejnych fragmentów obrazu (dowolny iterowalny zbiór tablic)."""
+    hist = np.zeros(bins, dtype=np.int64)
+    for chunk in chunks:
+        hist += np.bincount(np.asarray(chunk).ravel(), minlength=bins)[:bins]
+    return hist
+
+
+def compute_histogram(img_array, chunk_rows=None):
+    """
+    Histogram obrazu w skali szarości (uint8 lub uint16).
+    chunk_rows: jeżeli podane, obraz czytany jest pasami po tyle wierszy
+    (np. dla np.memmap), tak by w pamięci był tylko jeden pas naraz.
+    """
+    bins = histogram_bins(img_array.dtype)
+    if chunk_rows is None:
+        hist = np.bincount(img_array.ravel(), minlength=bins)
+    else:
+        hist = accumulate_histogram(
+            (img_array[i:i + chunk_rows] for i in range(0, img_array.shape[0], chunk_rows)),
+            bins)
+    return hist
+
+
+def compute_cumulative_histogram(hist):
+    """Oblicz skumulowany histogram."""
+    return np.cumsum(hist)
+
+
+def cumulative_histogram(img_array, chunk_rows=None, hist=None):
+    """Skumulowany histogram obrazu (CDF w liczbie pikseli); hist - gotowy histogram obrazu."""
+    if hist is None:
+        hist = compute_histogram(img_array, chunk_rows)
+    return compute_cumulative_histogram(hist)
+
+
+def percentile_from_histogram(hist, q):
+    """
+    Percentyl q (0-100) wyznaczony z histogramu, bez sortowania pikseli.
+    Interpolacja liniowa jak w np.percentile (metoda 'linear'), więc wynik
+    jest taki sam jak np.percentile(obraz, q).
+    """
+    cdf = np.cumsum(hist)
+    n = int(cdf[-1])
+    virtual_index = (n - 1) * np.true_divide(q, 100)
+    lower = np.floor(virtual_index)
+    t = virtual_index - lower
+    lower = int(lower)
+    upper = min(lower + 1, n - 1)
+    # k-ta wartość w porządku rosnącym: pierwszy kubełek, w którym cdf > k
+    a = float(np.searchsorted(cdf, lower, side='right'))
+    b = float(np.searchsorted(cdf, upper, side='right'))
+    diff = b - a
+    if t >= 0.5:
+        return b - diff * (1 - t)
+    return a + diff * t
+
+
+def histogram_statistic(hist, statistic='mean'):
+    """
+    Statystyka obrazu wyznaczona z jego histogramu: 'mean', 'median', 'std'
+    albo dowolna funkcja histogram -> liczba.
+    Średnia liczona na sumach całkowitych, więc równa img.mean().
+    """
+    if callable(statistic):
+        return statistic(hist)
+    hist = np.asarray(hist, dtype=np.int64)
+    n = int(hist.sum())
+    values = np.arange(hist.size, dtype=np.int64)
+    if statistic == 'mean':
+        return int(hist @ values) / n
+    if statistic == 'median':
+        return percentile_from_histogram(hist, 50)
+    if statistic == 'std':
+        mean = int(hist @ values) / n
+        return float(np.sqrt(hist @ (values - mean) ** 2 / n))
+    raise ValueError(f'Nieznana statystyka: {statistic}')
+
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Operacje punktowe jako tablice LUT i ich składanie w jeden potok.
+
+Każda operacja punktowa na obrazie 8-bitowym to tablica 256 wartości.
+Krok potoku to funkcja: histogram wejścia kroku -> LUT, bo część operacji
+(wyrównanie, hiperbolizacja, rozciąganie percentylowe) zależy od histogramu.
+Histogram kolejnego kroku wyznaczany jest z poprzedniego przez przeniesienie
+licznika każdego kubełka przez LUT, bez dotykania obrazu.
+
+Cały łańcuch składa się w jedną LUT (szarość → szarość albo, gdy ostatni
+krok to pseudokolorowanie, szarość → RGB) i jest stosowany jednym
+odczytem obrazu uint8.
+"""
+
+import numpy as np
+from histogram import compute_histogram, percentile_from_histogram, histogram_statistic
+
+IDENTITY = np.arange(256, dtype=np.uint8)
+
+
+# --- Tablice LUT ---
+
+def equalization_lut(hist):
+    """Wyrównanie histogramu: H_equal(g) = (L-1) * CDF(g) / N."""
+    cdf = np.cumsum(hist)
+    return (255 * cdf / cdf[-1]).astype(np.uint8)
+
+
+def hyperbolization_lut(hist, alpha=-1/3):
+    """Hiperbolizacja histogramu: H_hyper(g) = (L-1) * [CDF(g)/N]^(1/(1+α))."""
+    cdf = np.cumsum(hist)
+    cdf_hyper = np.power(cdf / cdf[-1], 1 / (1 + alpha))
+    return (255 * cdf_hyper).astype(np.uint8)
+
+
+def gamma_lut(gamma, dtype=np.float64):
+    """
+    Korekcja gamma: g_out = 255 × (g_in / 255)^γ.
+    dtype – typ obliczeń pośrednich (taki jak w skrypcie, który LUT zastępuje).
+    """
+    normalized = IDENTITY.astype(dtype) / 255.0
+    return (np.power(normalized, gamma) * 255).astype(np.uint8)
+
+
+def contrast_stretch_lut(p_low, p_high):
+    """Liniowe rozciągnięcie zakresu [p_low, p_high] na [0, 255]."""
+    return np.clip((IDENTITY - p_low) * 255.0 / (p_high - p_low), 0, 255).astype(np.uint8)
+
+
+def pseudocolor_lut(r_map, g_map, b_map):
+    """LUT szarość → RGB o kształcie (256, 3)."""
+    return np.stack([r_map, g_map, b_map], axis=-1).astype(np.uint8)
+
+
+# --- Kroki potoku (histogram wejścia -> LUT) ---
+
+def equalization_step():
+    return equalization_lut
+
+
+def hyperbolization_step(alpha=-1/3):
+    return lambda hist: hyperbolization_lut(hist, alpha)
+
+
+def gamma_step(gamma, dtype=np.float64):
+    lut = gamma_lut(gamma, dtype)
+    return lambda hist: lut
+
+
+def contrast_stretch_step(lower_percentile=1, upper_percentile=99):
+    return lambda hist: contrast_stretch_lut(percentile_from_histogram(hist, lower_percentile),
+                                             percentile_from_histogram(hist, upper_percentile))
+
+
+def pseudocolor_step(r_map, g_map, b_map):
+    lut = pseudocolor_lut(r_map, g_map, b_map)
+    return lambda hist: lut
+
+
+# --- Składanie i stosowanie ---
+
+def compose_pipeline(steps, hist):
+    """
+    Złóż kroki w jedną LUT dla obrazu o histogramie hist.
+    Krok zwracający LUT RGB musi być ostatni.
+    """
+    lut = IDENTITY
+    hist = np.asarray(hist, dtype=np.int64)
+    for i, step in enumerate(steps):
+        if lut.ndim != 1:
+            raise ValueError('Krok szarość → RGB musi być ostatni w potoku')
+        step_lut = step(hist)
+        lut = step_lut[lut]
+        if i < len(steps) - 1 and step_lut.ndim == 1:
+            # Histogram wyjścia kroku: licznik kubełka g trafia do step_lut[g]
+            hist = lut_histogram(hist, step_lut)
+    return lut
+
+
+def lut_histogram(hist, lut):
+    """Histogram obrazu po przekształceniu przez LUT szarość → szarość."""
+    return np.bincount(lut, weights=hist, minlength=256).astype(np.int64)
+
+
+def find_gamma_for_target(hist, target, statistic='mean', tolerance=0.5,
+                          gamma_low=0.1, gamma_high=5.0, max_iter=50,
+                          dtype=np.float64):
+    """
+    Bisekcja po γ w dziedzinie histogramu: każda iteracja to LUT gamma
+    i statystyka histogramu wyjściowego (O(256)), bez przekształcania obrazu.
+    statistic: 'mean', 'median', 'std' lub funkcja histogram -> liczba.
+    
+    Kierunek bisekcji ustalany jest z wartości na końcach przedziału;
+    dla statystyk niemonotonicznych względem γ (np. 'std') wynik jest
+    rozwiązaniem lokalnym w [gamma_low, gamma_high].
+    Zwraca tuple (gamma, osiągnięta wartość statystyki).
+    """
+    hist = np.asarray(hist, dtype=np.int64)
+    
+    def evaluate(gamma):
+        return histogram_statistic(lut_histogram(hist, gamma_lut(gamma, dtype)), statistic)
+    
+    decreasing = evaluate(gamma_low) >= evaluate(gamma_high)
+    gamma_mid = 1.0
+    value = target
+    
+    for _ in range(max_iter):
+        gamma_mid = (gamma_low + gamma_high) / 2
+        value = evaluate(gamma_mid)
+        
+        if abs(value - target) < tolerance:
+            return gamma_mid, value
+        
+        if (value < target) == decreasing:
+            gamma_high = gamma_mid
+        else:
+            gamma_low = gamma_mid
+    
+    # Zwróć najlepsze przybliżenie
+    return gamma_mid, value
+
+
+def apply_lut(img_array, lut, out=None):
+    """
+    Zastosuj LUT jednym odczytem obrazu uint8.
+    out – opcjonalny bufor wyjściowy o kształcie img_array.shape + lut.shape[1:].
+    """
+    img_array = np.asarray(img_array, dtype=np.uint8)
+    # mode='clip' pozwala pisać prosto do out (indeksy uint8 zawsze są w zakresie)
+    return np.take(lut, img_array, axis=0, out=out, mode='clip')
+
+
+def run_pipeline(img_array, steps, out=None):
+    """Histogram obrazu, złożenie kroków w jedną LUT i jedno jej zastosowanie."""
+    lut = compose_pipeline(steps, compute_histogram(img_array))
+    return apply_lut(img_array, lut, out)
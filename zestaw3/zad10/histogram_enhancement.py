@@ -5,20 +5,22 @@ Zadanie 10: Zwiększenie kontrastu poprzez operacje punktowe oparte na histogram
 Pipeline przetwarzania obrazu Całunu Turyńskiego w celu poprawy widoczności twarzy.
 """
 
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from PIL import Image
 import matplotlib.pyplot as plt
-from scipy import ndimage
 
-def compute_histogram(img_array):
-    """Oblicz histogram dla obrazu w skali szarości (0-255)."""
-    hist = np.zeros(256, dtype=int)
-    for value in range(256):
-        hist[value] = np.sum(img_array == value)
-    return hist
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pixel_views import load_image
+from histogram import compute_histogram, percentile_from_histogram
+from point_ops import (equalization_lut, contrast_stretch_lut, gamma_lut,
+                       apply_lut)
 
 def plot_histogram(img_array, title, filename, show_stats=True):
-    """Rysuj histogram obrazu z opcjonalnymi statystykami."""
+    """Rysuj histogram obrazu z opcjonalnymi statystykami; zwraca histogram."""
     hist = compute_histogram(img_array)
     
     fig, ax = plt.subplots(figsize=(10, 5))
@@ -44,63 +46,139 @@ def plot_histogram(img_array, title, filename, show_stats=True):
     plt.savefig(filename, dpi=150)
     plt.close()
     print(f"Zapisano histogram: {filename}")
+    return hist
 
 def save_image_with_histogram(img_array, img_filename, hist_filename, title):
-    """Zapisz obraz i jego histogram."""
+    """Zapisz obraz i jego histogram; zwraca histogram do dalszych kroków."""
     # Zapisz obraz
     img_pil = Image.fromarray(img_array)
     img_pil.save(img_filename)
     print(f"Zapisano obraz: {img_filename}")
     
     # Zapisz histogram
-    plot_histogram(img_array, title, hist_filename)
+    return plot_histogram(img_array, title, hist_filename)
 
-def contrast_stretching(img_array, lower_percentile=1, upper_percentile=99):
+def contrast_stretching(img_array, lower_percentile=1, upper_percentile=99, hist=None):
     """
     Rozciąganie kontrastu - mapowanie zakresu wartości na [0, 255].
     Używa percentyli zamiast min/max by uniknąć wpływu pojedynczych outlierów.
+    hist - histogram img_array, jeśli już policzony
     """
-    p_low = np.percentile(img_array, lower_percentile)
-    p_high = np.percentile(img_array, upper_percentile)
+    if hist is None:
+        hist = compute_histogram(img_array)
+    p_low = percentile_from_histogram(hist, lower_percentile)
+    p_high = percentile_from_histogram(hist, upper_percentile)
     
     print(f"  Percentyl {lower_percentile}%: {p_low:.2f}")
     print(f"  Percentyl {upper_percentile}%: {p_high:.2f}")
     
-    # Mapowanie liniowe
-    img_stretched = np.clip((img_array - p_low) * 255.0 / (p_high - p_low), 0, 255)
-    
-    return img_stretched.astype(np.uint8)
+    # Mapowanie liniowe (jako LUT)
+    return apply_lut(img_array, contrast_stretch_lut(p_low, p_high))
 
-def histogram_equalization(img_array):
-    """Wyrównanie histogramu."""
-    hist = compute_histogram(img_array)
-    cdf = np.cumsum(hist)
-    
-    # Normalizacja CDF do zakresu [0, 255]
-    cdf_normalized = (255 * cdf / cdf[-1]).astype(np.uint8)
-    
-    # Mapowanie
-    img_equalized = cdf_normalized[img_array]
-    
-    return img_equalized
+def histogram_equalization(img_array, hist=None):
+    """Wyrównanie histogramu (hist - gotowy histogram img_array)."""
+    if hist is None:
+        hist = compute_histogram(img_array)
+    return apply_lut(img_array, equalization_lut(hist))
 
-def clahe(img_array, clip_limit=2.0, tile_size=8):
+def clahe(img_array, clip_limit=2.0, tile_size=8, workers=1):
     """
     Contrast Limited Adaptive Histogram Equalization (CLAHE).
     Lokalne wyrównanie histogramu z ograniczeniem wzmocnienia szumu.
+    
+    - tile_size: liczba kafli w każdym kierunku (siatka tile_size×tile_size),
+    - clip_limit: limit kubełka jako krotność średniej liczności kubełka
+      w kaflu; nadmiar rozdzielany jest równomiernie na wszystkie kubełki,
+    - workers: liczba wątków; pasy kafli (histogramy) i pasy wierszy
+      (interpolacja) liczone są równolegle.
+    
+    Każdy kafel ma własną LUT (wyrównanie przyciętego histogramu),
+    a wartość piksela to dwuliniowa interpolacja LUT czterech
+    najbliższych kafli – cztery zbiorcze odczyty z tablicy LUT.
     """
-    from skimage import exposure
+    img_array = np.asarray(img_array, dtype=np.uint8)
+    h, w = img_array.shape
+    grid = max(1, int(tile_size))
+    tile_h = -(-h // grid)
+    tile_w = -(-w // grid)
+    
+    # Dopełnij obraz do wielokrotności rozmiaru kafla (odbicie na brzegu)
+    padded = np.pad(img_array, ((0, tile_h * grid - h), (0, tile_w * grid - w)),
+                    mode='reflect' if min(h, w) > 1 else 'edge')
+    limit = max(1, int(clip_limit * tile_h * tile_w / 256))
+    
+    luts = np.empty((grid, grid, 256), dtype=np.uint8)
+    out = np.empty_like(img_array)
+    bands = np.linspace(0, h, max(1, workers) + 1).astype(int)
+    
+    def tile_row(ty):
+        rows = padded[ty * tile_h:(ty + 1) * tile_h]
+        luts[ty] = _clahe_tile_luts(rows, grid, tile_w, limit)
     
-    # CLAHE wymaga wartości float w [0, 1]
-    img_float = img_array.astype(float) / 255.0
+    def pixel_rows(band):
+        y0, y1 = band
+        _clahe_interpolate(img_array, luts, tile_h, tile_w, y0, y1, out)
     
-    # Zastosuj CLAHE
-    img_clahe = exposure.equalize_adapthist(img_float, 
-                                            clip_limit=clip_limit,
-                                            nbins=256)
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(tile_row, range(grid)))
+            list(pool.map(pixel_rows, zip(bands[:-1], bands[1:])))
+    else:
+        for ty in range(grid):
+            tile_row(ty)
+        pixel_rows((0, h))
     
-    # Przywróć do uint8
-    return (img_clahe * 255).astype(np.uint8)
+    return out
+
+def _clahe_tile_luts(rows, grid, tile_w, limit):
+    """LUT dla każdego kafla w jednym pasie kafli (grid kafli obok siebie)."""
+    tile_h = rows.shape[0]
+    # Numer kafla dla każdej kolumny -> histogramy wszystkich kafli jednym bincount
+    tile_idx = np.repeat(np.arange(grid), tile_w)
+    keys = tile_idx[None, :] * 256 + rows
+    hist = np.bincount(keys.ravel(), minlength=grid * 256).reshape(grid, 256)
+    
+    # Przycięcie i równomierne rozłożenie nadmiaru
+    excess = np.maximum(hist - limit, 0).sum(axis=1)
+    hist = np.minimum(hist, limit) + (excess // 256)[:, None]
+    residual = excess % 256
+    step = 256 // np.maximum(residual, 1)
+    bins = np.arange(256)
+    hist += (bins % step[:, None] == 0) & (bins // step[:, None] < residual[:, None])
+    
+    cdf = np.cumsum(hist, axis=1)
+    return np.clip(np.rint(cdf * (255.0 / (tile_h * tile_w))), 0, 255).astype(np.uint8)
+
+def _clahe_interpolate(img_array, luts, tile_h, tile_w, y0, y1, out):
+    """Dwuliniowa interpolacja LUT sąsiednich kafli dla wierszy [y0, y1)."""
+    grid = luts.shape[0]
+    
+    def axis_weights(coords, tile):
+        pos = (coords + 0.5) / tile - 0.5
+        lo = np.floor(pos).astype(int)
+        frac = (pos - lo).astype(np.float32)
+        frac[lo < 0] = 0.0
+        frac[lo >= grid - 1] = 0.0
+        lo = np.clip(lo, 0, grid - 1)
+        hi = np.minimum(lo + 1, grid - 1)
+        return lo, hi, frac
+    
+    ty0, ty1, fy = axis_weights(np.arange(y0, y1), tile_h)
+    tx0, tx1, fx = axis_weights(np.arange(img_array.shape[1]), tile_w)
+    
+    flat = luts.reshape(-1)
+    values = img_array[y0:y1].astype(np.intp)
+    
+    def gather(ty, tx):
+        return flat[(ty[:, None] * grid + tx[None, :]) * 256 + values]
+    
+    fx = fx[None, :]
+    top = gather(ty0, tx0) * (1 - fx) + gather(ty0, tx1) * fx
+    bottom = gather(ty1, tx0) * (1 - fx) + gather(ty1, tx1) * fx
+    fy = fy[:, None]
+    blended = top * (1 - fy) + bottom * fy
+    np.clip(np.rint(blended), 0, 255, out=blended)
+    out[y0:y1] = blended
 
 def gamma_correction(img_array, gamma=1.5):
     """
@@ -108,20 +186,12 @@ def gamma_correction(img_array, gamma=1.5):
     gamma < 1: rozjaśnia ciemne obszary
     gamma > 1: przyciemnia jasne obszary
     """
-    # Normalizacja do [0, 1]
-    img_normalized = img_array.astype(float) / 255.0
-    
-    # Zastosuj transformację gamma
-    img_gamma = np.power(img_normalized, gamma)
-    
-    # Przywróć do uint8
-    return (img_gamma * 255).astype(np.uint8)
+    return apply_lut(img_array, gamma_lut(gamma))
 
 def main():
     # Wczytaj obraz
     img_path = '../CalunTurynski.png'
-    img = Image.open(img_path).convert('L')
-    img_original = np.array(img)
+    img_original = load_image(img_path, 'L')
     
     print("="*60)
     print("Zadanie 10: Pipeline przetwarzania Całunu Turyńskiego")
@@ -135,7 +205,7 @@ def main():
     print("\n" + "="*60)
     print("Krok 0: Oryginalny obraz")
     print("="*60)
-    save_image_with_histogram(img_original, 
+    hist_original = save_image_with_histogram(img_original,
                                'step0_original.png',
                                'step0_histogram.png',
                                'Histogram - Obraz oryginalny')
@@ -144,8 +214,9 @@ def main():
     print("\n" + "="*60)
     print("Krok 1: Rozciąganie kontrastu (percentyle 1-99)")
     print("="*60)
-    img_stretched = contrast_stretching(img_original, lower_percentile=1, upper_percentile=99)
-    save_image_with_histogram(img_stretched,
+    img_stretched = contrast_stretching(img_original, lower_percentile=1, upper_percentile=99,
+                                        hist=hist_original)
+    hist_stretched = save_image_with_histogram(img_stretched,
                                'step1_contrast_stretched.png',
                                'step1_histogram.png',
                                'Histogram - Po rozciągnięciu kontrastu')
@@ -154,26 +225,23 @@ def main():
     print("\n" + "="*60)
     print("Krok 2: Wyrównanie histogramu (Histogram Equalization)")
     print("="*60)
-    img_equalized = histogram_equalization(img_stretched)
+    img_equalized = histogram_equalization(img_stretched, hist_stretched)
     save_image_with_histogram(img_equalized,
                                'step2_equalized.png',
                                'step2_histogram.png',
                                'Histogram - Po wyrównaniu histogramu')
     
-    # Krok 3: CLAHE (opcjonalne, jeśli scikit-image dostępne)
+    # Krok 3: CLAHE (alternatywna metoda lokalna)
     print("\n" + "="*60)
     print("Krok 3: CLAHE (Contrast Limited Adaptive HE)")
     print("="*60)
-    try:
-        img_clahe = clahe(img_original, clip_limit=3.0, tile_size=8)
-        save_image_with_histogram(img_clahe,
-                                   'step3_clahe.png',
-                                   'step3_histogram.png',
-                                   'Histogram - Po CLAHE (clip_limit=3.0)')
-        print("  CLAHE wykonane pomyślnie (alternatywna metoda)")
-    except ImportError:
-        print("  scikit-image nie dostępne, pomijam CLAHE")
-        print("  (CLAHE jest alternatywną metodą, nie jest wymagane)")
+    img_clahe = clahe(img_original, clip_limit=3.0, tile_size=8,
+                      workers=os.cpu_count() or 1)
+    save_image_with_histogram(img_clahe,
+                               'step3_clahe.png',
+                               'step3_histogram.png',
+                               'Histogram - Po CLAHE (clip_limit=3.0)')
+    print("  CLAHE wykonane pomyślnie (alternatywna metoda)")
     
     # Krok 4: Korekcja gamma na wyrównanym obrazie
     print("\n" + "="*60)
@@ -193,7 +261,7 @@ def main():
     print("  0. Oryginalny obraz (niski kontrast, wąski zakres)")
     print("  1. Rozciąganie kontrastu (rozszerza zakres do [0, 255])")
     print("  2. Wyrównanie histogramu (równomierne rozłożenie wartości)")
-    print("  3. CLAHE (lokalne wyrównanie z ograniczeniem szumu) *opcjonalne*")
+    print("  3. CLAHE (lokalne wyrównanie z ograniczeniem szumu) *alternatywa*")
     print("  4. Korekcja gamma (rozjaśnienie ciemnych obszarów)")
     print("\nNajlepszy rezultat: Krok 2 lub 4 (w zależności od preferencji)")
     print("\n✓ Wszystkie obrazy i histogramy wygenerowane pomyślnie!")
@@ -6,9 +6,14 @@ Zadanie 14: Operacje logiczne i arytmetyczne na obrazach
 (b) Operacje logiczne - podkreślenie cyjanowych krawędzi na obrazie RGB
 """
 
+import os
+import sys
 import numpy as np
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pixel_views import load_image
+
 def arithmetic_red_overlay(img_gray, edges):
     """
     (a) Operacje arytmetyczne do podkreślenia krawędzi w kolorze czerwonym.
@@ -86,11 +91,9 @@ def main():
     print("-"*60)
     
     # Wczytaj obrazy
-    img_bakterie = Image.open('../bakterie.png').convert('L')
-    img_edges = Image.open('../bakterie_krawedzie.png').convert('L')
+    bakterie_array = load_image('../bakterie.png', 'L')
+    edges_array = load_image('../bakterie_krawedzie.png', 'L')
     
-    bakterie_array = np.array(img_bakterie)
-    edges_array = np.array(img_edges)
     
     print(f"Wczytano bakterie.png: {bakterie_array.shape}")
     print(f"Wczytano bakterie_krawedzie.png: {edges_array.shape}")
@@ -115,8 +118,7 @@ def main():
     print("-"*60)
     
     # Wczytaj obraz RGB
-    img_bakterie_rgb = Image.open('../bakterieRGB.png').convert('RGB')
-    bakterie_rgb_array = np.array(img_bakterie_rgb)
+    bakterie_rgb_array = load_image('../bakterieRGB.png', 'RGB')
     
     print(f"Wczytano bakterieRGB.png: {bakterie_rgb_array.shape}")
     
@@ -9,11 +9,19 @@ Pipeline przetwarzania zaszumionego obrazu ptaki.png:
 (d) Bezpośrednie uśrednianie dla porównania
 """
 
+import os
+import sys
 import numpy as np
 from PIL import Image
 import matplotlib.pyplot as plt
 from scipy import ndimage
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pixel_views import load_image
+from histogram import compute_histogram
+from point_ops import gamma_lut, apply_lut, find_gamma_for_target
+
 def sinusoidal_window_2d(height, width):
     """
     Utworzenie 2D okna sinusoidalnego (okna Hanna).
@@ -53,41 +61,20 @@ def averaging_filter_3x3(img_array):
 def gamma_correction(img_array, gamma):
     """
     Korekcja gamma: g_out = 255 × (g_in / 255)^γ
+    Obliczenia w float32 na 256-elementowej LUT, potem jeden odczyt obrazu.
     """
-    # Normalizacja do [0, 1]
-    img_normalized = img_array.astype(np.float32) / 255.0
-    
-    # Zastosuj transformację gamma
-    img_gamma = np.power(img_normalized, gamma)
-    
-    # Przywróć do [0, 255]
-    return (img_gamma * 255).astype(np.uint8)
+    return apply_lut(img_array, gamma_lut(gamma, dtype=np.float32))
 
 def find_gamma_for_mean(img_array, target_mean, tolerance=0.5):
     """
     Znajdź współczynnik gamma, który da średnią jasność zbliżoną do target_mean.
-    Używa prostej metody bisekcji.
+    Używa prostej metody bisekcji na histogramie obrazu: średnia po
+    operacji punktowej zależy tylko od histogramu, więc obraz
+    przekształcany jest dopiero raz, po znalezieniu γ.
     """
-    gamma_low = 0.1
-    gamma_high = 5.0
-    gamma_mid = 1.0
-    mean_test = target_mean
-    
-    for _ in range(50):  # maksymalnie 50 iteracji
-        gamma_mid = (gamma_low + gamma_high) / 2
-        img_test = gamma_correction(img_array, gamma_mid)
-        mean_test = img_test.mean()
-        
-        if abs(mean_test - target_mean) < tolerance:
-            return gamma_mid, mean_test
-        
-        if mean_test < target_mean:
-            gamma_high = gamma_mid
-        else:
-            gamma_low = gamma_mid
-    
-    # Zwróć najlepsze przybliżenie
-    return gamma_mid, mean_test
+    return find_gamma_for_target(compute_histogram(img_array), target_mean,
+                                 statistic='mean', tolerance=tolerance,
+                                 dtype=np.float32)
 
 def save_image_with_stats(img_array, filename, title):
     """Zapisz obraz wraz z statystykami."""
@@ -121,8 +108,7 @@ def main():
     
     # Wczytaj obraz
     img_path = '../ptaki.png'
-    img = Image.open(img_path).convert('L')
-    img_original = np.array(img)
+    img_original = load_image(img_path, 'L')
     
     print(f"\nWczytano obraz: {img_original.shape}")
     print(f"Zakres wartości: [{img_original.min()}, {img_original.max()}]")
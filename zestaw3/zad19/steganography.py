@@ -6,9 +6,14 @@ Zadanie 19: Steganografia LSB (Least Significant Bit)
 (b) Ukrycie nowego obrazu w obrazie nośnikowym
 """
 
+import os
+import sys
 import numpy as np
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pixel_views import load_image
+
 def extract_lsb_image(carrier_img_array, output_bits=1):
     """
     Wydobycie obrazu ukrytego w najmłodszych bitach (LSB).
@@ -117,8 +122,7 @@ def main():
     print("="*60)
     
     # Wczytaj obraz z ukrytą informacją
-    carrier_img = Image.open('../AlbertEinstein-modified.png').convert('L')
-    carrier_array = np.array(carrier_img)
+    carrier_array = load_image('../AlbertEinstein-modified.png', 'L')
     
     print(f"Wczytano obraz nośnikowy: {carrier_array.shape}")
     print(f"Zakres wartości: [{carrier_array.min()}, {carrier_array.max()}]")
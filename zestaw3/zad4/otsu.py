@@ -7,13 +7,17 @@ Zadanie 4: Binaryzacja histogramu - metoda Otsu
 """
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import numpy as np
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pixel_views import load_image
+
 
 def load_gray(path):
-    img = Image.open(path).convert('L')
-    return np.asarray(img, dtype=np.uint8)
+    return load_image(path, 'L')
 
 
 def save_binary(arr, path):
@@ -28,36 +32,38 @@ def otsu_threshold(gray):
     Returns optimal threshold T (0-255).
     """
     hist, _ = np.histogram(gray.flatten(), bins=256, range=(0, 256))
-    total = gray.size
-    
-    # Normalizuj histogram (prawdopodobieństwa)
-    hist = hist.astype(np.float64) / total
-    
-    #累積 sum i mean
-    cum_sum = np.cumsum(hist)
-    cum_mean = np.cumsum(hist * np.arange(256))
-    global_mean = cum_mean[-1]
-    
-    # Between-class variance dla każdego możliwego progu
-    w0 = cum_sum
-    w1 = 1.0 - w0
-    
-    # Unikaj dzielenia przez zero
-    mean0 = np.zeros(256)
-    mean1 = np.zeros(256)
-    
-    mask0 = w0 > 0
-    mask1 = w1 > 0
-    
-    mean0[mask0] = cum_mean[mask0] / w0[mask0]
-    mean1[mask1] = (global_mean - cum_mean[mask1]) / w1[mask1]
-    
-    # Between-class variance
-    var_between = w0 * w1 * (mean0 - mean1) ** 2
-    
-    # Znajdź prog maksymalizujący wariancję międzyklasową
-    threshold = np.argmax(var_between)
-    return int(threshold)
+    return int(otsu_threshold_from_histogram(hist))
+
+
+def between_class_scores(n0, s0, n, s):
+    """
+    Wariancja międzyklasowa z dokładnością do stałego czynnika 1/n⁴ (nie
+    zmienia argmax) dla progu o liczności n0 i sumie s0 klasy dolnej
+    (całość: n, s): (n·s0 - s·n0)² / (n0·(n - n0)), 0 gdy klasa jest pusta.
+    Liczniki i sumy są całkowite, więc licznik liczony jest dokładnie,
+    a wynik dla tych samych (n0, s0, n, s) jest zawsze ten sam niezależnie
+    od tego, skąd pochodzą (cały histogram czy tylko niepuste kubełki).
+    """
+    num = (n * s0 - s * n0).astype(np.float64)
+    den = n0 * (n - n0)
+    scores = np.zeros(num.shape)
+    np.divide(num * num, den, out=scores, where=den > 0)
+    return scores
+
+
+def otsu_threshold_from_histogram(hist):
+    """
+    Próg Otsu wyznaczony wyłącznie z histogramu (256 kubełków w ostatniej osi).
+    Działa też dla stosu histogramów (..., 256) – zwraca wtedy tablicę progów.
+    Przy remisie wybierany jest najmniejszy próg (pusty kubełek ma ten sam
+    wynik co poprzedni niepusty), a gdy żaden podział nie ma dodatniej
+    wariancji - 0.
+    """
+    hist = np.asarray(hist, dtype=np.int64)
+    n0 = np.cumsum(hist, axis=-1)
+    s0 = np.cumsum(hist * np.arange(256), axis=-1)
+    scores = between_class_scores(n0, s0, n0[..., -1:], s0[..., -1:])
+    return np.argmax(scores, axis=-1)
 
 
 def apply_threshold(gray, T):
@@ -66,38 +72,56 @@ def apply_threshold(gray, T):
     return binary
 
 
+def gray_histogram(gray):
+    """Histogram 256 kubełków w jednym przejściu po obrazie."""
+    return np.bincount(np.asarray(gray, dtype=np.uint8).ravel(), minlength=256)
+
+
 def otsu_three_class_iterative(gray, delta_threshold=2):
     """
     Iteracyjne trójklasowe progowanie Otsu.
     Dzieli obraz na 3 klasy: ciemne, średnie, jasne.
     Iteruje aż różnica progów między iteracjami < delta_threshold.
     
+    Średnie klas liczone są z histogramu i jego sum skumulowanych, więc
+    obraz odczytywany jest tylko dwa razy: raz do histogramu i raz przy
+    mapowaniu przez tablicę LUT.
+    
     Zwraca tuple (T1, T2, result_image) gdzie:
     - T1: próg między klasą ciemną a średnią
     - T2: próg między klasą średnią a jasną
     - result_image: obraz z wartościami 0 (ciemna), 128 (średnia), 255 (jasna)
     """
+    hist = gray_histogram(gray).astype(np.int64)
+    
+    # Sumy skumulowane z zerem na początku: zakres [a, b) to cum[b] - cum[a]
+    cum_count = np.concatenate(([0], np.cumsum(hist)))
+    cum_sum = np.concatenate(([0], np.cumsum(hist * np.arange(256))))
+    
+    def class_mean(a, b):
+        a, b = max(a, 0), min(b, 256)
+        count = cum_count[b] - cum_count[a] if b > a else 0
+        if count == 0:
+            return None
+        return (cum_sum[b] - cum_sum[a]) / count
+    
     # Inicjalizacja progów (1/3 i 2/3 zakresu)
     T1_old, T2_old = 85, 170
     max_iter = 100
     
     for iteration in range(max_iter):
-        # Podziel na 3 klasy
-        class0 = gray[gray < T1_old]           # ciemna
-        class1 = gray[(gray >= T1_old) & (gray < T2_old)]  # średnia
-        class2 = gray[gray >= T2_old]          # jasna
+        # Średnie klas: ciemna [0, T1), średnia [T1, T2), jasna [T2, 256)
+        mean0 = class_mean(0, T1_old)
+        mean1 = class_mean(T1_old, T2_old)
+        mean2 = class_mean(T2_old, 256)
         
         # Oblicz nowe progi jako średnie między średnimi klas
-        if len(class0) > 0 and len(class1) > 0:
-            mean0 = np.mean(class0)
-            mean1 = np.mean(class1)
+        if mean0 is not None and mean1 is not None:
             T1_new = int((mean0 + mean1) / 2)
         else:
             T1_new = T1_old
         
-        if len(class1) > 0 and len(class2) > 0:
-            mean1 = np.mean(class1)
-            mean2 = np.mean(class2)
+        if mean1 is not None and mean2 is not None:
             T2_new = int((mean1 + mean2) / 2)
         else:
             T2_new = T2_old
@@ -110,20 +134,88 @@ def otsu_three_class_iterative(gray, delta_threshold=2):
         
         T1_old, T2_old = T1_new, T2_new
     
-    # Utwórz obraz wynikowy z 3 poziomami
-    result = np.zeros_like(gray, dtype=np.uint8)
-    result[gray < T1_old] = 0
-    result[(gray >= T1_old) & (gray < T2_old)] = 128
-    result[gray >= T2_old] = 255
+    # Utwórz obraz wynikowy z 3 poziomami przez tablicę LUT
+    result = labels_lut([T1_old, T2_old], [0, 128, 255])[gray]
     
     return T1_old, T2_old, result
 
 
-def otsu_local(gray, window_size=11):
+def labels_lut(thresholds, levels):
+    """
+    Tablica LUT 256 wartości: poziom levels[k] dla szarości w klasie k,
+    gdzie klasy rozdzielone są progami (g >= T należy do klasy wyższej).
+    """
+    bins = np.searchsorted(np.asarray(thresholds), np.arange(256), side='right')
+    return np.asarray(levels, dtype=np.uint8)[bins]
+
+
+def otsu_multiclass_thresholds(hist, n_classes=3):
+    """
+    Progi wieloklasowego Otsu wyznaczone wyłącznie z histogramu.
+    
+    Maksymalizacja wariancji międzyklasowej jest równoważna maksymalizacji
+    sumy S_k² / W_k po klasach (W_k – liczność, S_k – suma wartości).
+    Programowanie dynamiczne po progach: O(n_classes · 256²) operacji
+    na tablicach, niezależnie od rozmiaru obrazu.
+    
+    Zwraca listę n_classes-1 rosnących progów; klasa k to [T_k, T_{k+1}).
+    """
+    if not 2 <= n_classes <= 256:
+        raise ValueError(f'Liczba klas musi być w zakresie 2..256: {n_classes}')
+    
+    hist = np.asarray(hist, dtype=np.float64)
+    cum_count = np.concatenate(([0.0], np.cumsum(hist)))
+    cum_sum = np.concatenate(([0.0], np.cumsum(hist * np.arange(256))))
+    
+    # cost[i, j] = S²/W dla klasy obejmującej kubełki [i, j), i < j
+    d_count = cum_count[None, :] - cum_count[:, None]
+    d_sum = cum_sum[None, :] - cum_sum[:, None]
+    cost = np.zeros_like(d_count)
+    np.divide(d_sum ** 2, d_count, out=cost, where=d_count > 0)
+    cost[np.tril_indices(257)] = -np.inf
+    
+    # best[j] – najlepszy wynik dla podziału kubełków [0, j) na k+1 klas
+    best = cost[0].copy()
+    choices = []
+    for _ in range(n_classes - 1):
+        candidates = best[:, None] + cost
+        choices.append(np.argmax(candidates, axis=0))
+        best = candidates[choices[-1], np.arange(257)]
+    
+    # Odtwórz progi od końca
+    thresholds = []
+    j = 256
+    for choice in reversed(choices):
+        j = int(choice[j])
+        thresholds.append(j)
+    return thresholds[::-1]
+
+
+def otsu_multiclass(gray, n_classes=3):
+    """
+    Wieloklasowe progowanie Otsu: jeden odczyt obrazu na histogram
+    i jeden na mapowanie LUT. Poziomy wyjściowe rozłożone równomiernie
+    w [0, 255]. Zwraca tuple (thresholds, result_image).
+    """
+    thresholds = otsu_multiclass_thresholds(gray_histogram(gray), n_classes)
+    levels = np.round(np.linspace(0, 255, n_classes))
+    return thresholds, labels_lut(thresholds, levels)[gray]
+
+
+def otsu_local(gray, window_size=11, mode='sliding'):
     """
     Lokalne progowanie Otsu w oknie window_size×window_size.
     Symetryczne odbicie na brzegach (np.pad mode='reflect').
+    
+    mode='sliding': przesuwany histogram (domyślnie, szybki),
+    mode='naive': osobny histogram dla każdego piksela (wersja referencyjna).
+    Oba tryby dają identyczny wynik.
     """
+    if mode == 'sliding':
+        return otsu_local_sliding(gray, window_size)
+    if mode != 'naive':
+        raise ValueError(f'Nieznany tryb: {mode}')
+    
     h, w = gray.shape
     half = window_size // 2
     
@@ -146,6 +238,143 @@ def otsu_local(gray, window_size=11):
     return result
 
 
+def otsu_local_sliding(gray, window_size=11):
+    """
+    Lokalne Otsu z przesuwanym histogramem (Huang/Perreault).
+    
+    Histogramy wszystkich okien wiersza trzymane są jako całkowite
+    liczniki; przy przejściu do następnego wiersza każde okno zyskuje
+    window_size pikseli wiersza wchodzącego i traci tyle samo z wiersza
+    wychodzącego (dwa np.bincount dla całego wiersza). Wariancja
+    międzyklasowa liczona jest tylko w niepustych kubełkach okna,
+    z całkowitych sum bieżących liczności i wartości (_window_thresholds).
+    """
+    half = window_size // 2
+    padded = np.pad(gray, pad_width=half, mode='reflect')
+    result = np.zeros_like(gray, dtype=np.uint8)
+    _otsu_local_rows(padded, window_size, 0, gray.shape[0], result)
+    return result
+
+
+def _otsu_local_rows(padded, window_size, y_start, y_stop, out):
+    """
+    Progowanie wierszy [y_start, y_stop) obrazu wejściowego na podstawie
+    obrazu z marginesem padded; wynik trafia do out[0:y_stop-y_start].
+    """
+    half = window_size // 2
+    w = padded.shape[1] - 2 * half
+    size = w * 256
+    # Kubełek (okno x, szarość g) to x*256 + g; kolumny padded w oknie x
+    window_base = np.repeat(np.arange(w) * 256, window_size)
+    window_cols = (np.arange(w)[:, None] + np.arange(window_size)).ravel()
+    
+    # Histogramy wszystkich okien wiersza (liczniki całkowite)
+    hist = np.zeros(size, dtype=np.int64)
+    for row in padded[y_start:y_start + window_size]:
+        hist += np.bincount(window_base + row[window_cols], minlength=size)
+    
+    for y in range(y_start, y_stop):
+        if y > y_start:
+            # Przesunięcie okien w dół: wiersz y-1 wychodzi, y+window_size-1 wchodzi
+            hist -= np.bincount(window_base + padded[y - 1][window_cols], minlength=size)
+            hist += np.bincount(window_base + padded[y + window_size - 1][window_cols], minlength=size)
+        
+        T_row = _window_thresholds(hist, w)
+        center = padded[y + half, half:half + w]
+        out[y - y_start] = np.where(center >= T_row, 255, 0)
+
+
+def _window_thresholds(hist, w):
+    """
+    Progi Otsu okien o spłaszczonych histogramach hist (w*256), liczone
+    tylko w niepustych kubełkach (w oknie 11×11 najwyżej 121 z 256):
+    liczności i sumy klasy dolnej to całkowite sumy bieżące po kolejnych
+    niepustych kubełkach okna. Wynik identyczny z
+    otsu_threshold_from_histogram (puste kubełki nie zmieniają wyniku).
+    """
+    index = np.flatnonzero(hist != 0)
+    bins = index & 255
+    counts = hist[index]
+    # Początki i długości odcinków kolejnych okien w index
+    starts = np.searchsorted(index >> 8, np.arange(w))
+    lengths = np.diff(np.append(starts, len(index)))
+    
+    n0 = np.cumsum(counts)
+    s0 = np.cumsum(counts * bins)
+    # Sumy bieżące od początku każdego okna
+    before_n = np.where(starts > 0, n0[starts - 1], 0)
+    before_s = np.where(starts > 0, s0[starts - 1], 0)
+    n = n0[starts + lengths - 1] - before_n
+    s = s0[starts + lengths - 1] - before_s
+    n0 -= np.repeat(before_n, lengths)
+    s0 -= np.repeat(before_s, lengths)
+    
+    scores = between_class_scores(n0, s0, np.repeat(n, lengths), np.repeat(s, lengths))
+    best = np.maximum.reduceat(scores, starts)
+    # Najmniejszy kubełek z najlepszym wynikiem (jak argmax)
+    first = np.minimum.reduceat(np.where(scores == np.repeat(best, lengths), bins, 255), starts)
+    return np.where(best > 0, first, 0)
+
+
+def _otsu_local_band(args):
+    """Zadanie procesu roboczego: jeden pas wierszy w pamięci współdzielonej."""
+    in_name, out_name, padded_shape, out_shape, window_size, y_start, y_stop = args
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    try:
+        padded = np.ndarray(padded_shape, dtype=np.uint8, buffer=shm_in.buf)
+        out = np.ndarray(out_shape, dtype=np.uint8, buffer=shm_out.buf)
+        _otsu_local_rows(padded, window_size, y_start, y_stop, out[y_start:y_stop])
+        # Zwolnij widoki przed zamknięciem segmentów
+        del padded, out
+    finally:
+        shm_in.close()
+        shm_out.close()
+
+
+def otsu_local_parallel(gray, window_size=11, workers=None):
+    """
+    Lokalne Otsu liczone równolegle w poziomych pasach.
+    
+    Obraz z symetrycznym odbiciem (np.pad mode='reflect') trafia raz do
+    pamięci współdzielonej; każdy pas czyta z niej swoje wiersze razem
+    z marginesem window_size//2 i zapisuje wynik bezpośrednio do
+    współdzielonego bufora wyjściowego. Wynik jest identyczny z otsu_local.
+    """
+    h, w = gray.shape
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, h))
+    if workers == 1:
+        return otsu_local_sliding(gray, window_size)
+    
+    half = window_size // 2
+    padded = np.pad(gray, pad_width=half, mode='reflect')
+    
+    shm_in = shared_memory.SharedMemory(create=True, size=padded.nbytes)
+    shm_out = shared_memory.SharedMemory(create=True, size=gray.size)
+    try:
+        np.ndarray(padded.shape, dtype=np.uint8, buffer=shm_in.buf)[:] = padded
+        
+        bounds = np.linspace(0, h, workers + 1).astype(int)
+        tasks = [
+            (shm_in.name, shm_out.name, padded.shape, gray.shape,
+             window_size, int(y0), int(y1))
+            for y0, y1 in zip(bounds[:-1], bounds[1:]) if y1 > y0
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_otsu_local_band, tasks))
+        
+        result = np.ndarray(gray.shape, dtype=np.uint8, buffer=shm_out.buf).copy()
+    finally:
+        shm_in.close()
+        shm_in.unlink()
+        shm_out.close()
+        shm_out.unlink()
+    
+    return result
+
+
 def main():
     folder = os.path.dirname(os.path.abspath(__file__))
     img_path = os.path.join(folder, '..', 'kwiatki.png')
@@ -167,10 +396,12 @@ def main():
     T1, T2, three_class = otsu_three_class_iterative(gray, delta_threshold=2)
     save_binary(three_class, os.path.join(folder, 'kwiatki_otsu_3class.png'))
     print(f'(b) Trójklasowe Otsu: T1 = {T1}, T2 = {T2}')
+    thresholds, _ = otsu_multiclass(gray, n_classes=3)
+    print(f'    dla porównania Otsu wieloklasowe (pełne przeszukanie): {thresholds}')
     
     # (c) Lokalne Otsu 11×11
     print('(c) Lokalne Otsu 11×11: przetwarzanie (może zająć chwilę)...')
-    binary_local = otsu_local(gray, window_size=11)
+    binary_local = otsu_local_parallel(gray, window_size=11)
     save_binary(binary_local, os.path.join(folder, 'kwiatki_otsu_local11x11.png'))
     print('(c) Lokalne Otsu 11×11: gotowe')
     
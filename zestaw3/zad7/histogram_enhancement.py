@@ -8,66 +8,49 @@ Dla obrazu RezydencjaDiabla.png:
 (c) Hiperbolizacja z α=-1/3 + wartości H_hyper(40/45/50)
 """
 
-import numpy as np
+import os
+import sys
 from PIL import Image
 import matplotlib.pyplot as plt
 
-def compute_histogram(img_array):
-    """Oblicz histogram dla obrazu w skali szarości (0-255)."""
-    hist = np.zeros(256, dtype=int)
-    for value in range(256):
-        hist[value] = np.sum(img_array == value)
-    return hist
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pixel_views import load_image
+from histogram import compute_histogram, cumulative_histogram
+from point_ops import equalization_lut, hyperbolization_lut, apply_lut
 
-def compute_cumulative_histogram(hist):
-    """Oblicz skumulowany histogram."""
-    return np.cumsum(hist)
-
-def histogram_equalization(img_array):
+def histogram_equalization(img_array, hist=None):
     """
     Wyrównanie histogramu.
     Transformacja: H_equal(g) = round((L-1) * CDF(g) / N)
     gdzie L=256, CDF - skumulowany histogram, N - liczba pikseli
+    hist - histogram img_array, jeśli już policzony
     """
-    hist = compute_histogram(img_array)
-    cdf = compute_cumulative_histogram(hist)
-    
-    # Normalizacja CDF do zakresu [0, 255]
-    N = img_array.size  # całkowita liczba pikseli
-    cdf_normalized = (255 * cdf / N).astype(np.uint8)
-    
-    # Mapowanie: dla każdego piksela o wartości g -> H_equal(g) = cdf_normalized[g]
-    img_equalized = cdf_normalized[img_array]
+    if hist is None:
+        hist = compute_histogram(img_array)
+    # Mapowanie jako LUT: dla każdej wartości g -> H_equal(g) = cdf_normalized[g]
+    cdf_normalized = equalization_lut(hist)
+    img_equalized = apply_lut(img_array, cdf_normalized)
     
     return img_equalized, cdf_normalized
 
-def histogram_hyperbolization(img_array, alpha=-1/3):
+def histogram_hyperbolization(img_array, alpha=-1/3, hist=None):
     """
     Hiperbolizacja histogramu z parametrem α.
     Transformacja: H_hyper(g) = round((L-1) * [CDF(g)/N]^(1/(1+α)))
+    hist - histogram img_array, jeśli już policzony
     """
-    hist = compute_histogram(img_array)
-    cdf = compute_cumulative_histogram(hist)
-    
-    N = img_array.size
-    # Normalizacja CDF do [0, 1]
-    cdf_norm = cdf / N
-    
-    # Hiperbolizacja: podnieś do potęgi 1/(1+α)
-    exponent = 1 / (1 + alpha)
-    cdf_hyper = np.power(cdf_norm, exponent)
-    
-    # Skalowanie do [0, 255]
-    cdf_hyper_scaled = (255 * cdf_hyper).astype(np.uint8)
-    
-    # Mapowanie
-    img_hyper = cdf_hyper_scaled[img_array]
+    if hist is None:
+        hist = compute_histogram(img_array)
+    cdf_hyper_scaled = hyperbolization_lut(hist, alpha)
+    img_hyper = apply_lut(img_array, cdf_hyper_scaled)
     
     return img_hyper, cdf_hyper_scaled
 
-def plot_histogram(img_array, title, filename):
-    """Rysuj histogram obrazu."""
-    hist = compute_histogram(img_array)
+def plot_histogram(img_array, title, filename, hist=None):
+    """Rysuj histogram obrazu (hist - gotowy histogram img_array)."""
+    if hist is None:
+        hist = compute_histogram(img_array)
     
     plt.figure(figsize=(10, 4))
     plt.bar(range(256), hist, width=1.0, color='gray', edgecolor='black', linewidth=0.5)
@@ -84,19 +67,18 @@ def plot_histogram(img_array, title, filename):
 def main():
     # Wczytaj obraz
     img_path = '../RezydencjaDiabla.png'
-    img = Image.open(img_path).convert('L')  # konwersja do skali szarości
-    img_array = np.array(img)
+    img_array = load_image(img_path, 'L')  # skala szarości, bez dodatkowej kopii
     
     print(f"Wczytano obraz: {img_array.shape}")
     print(f"Zakres wartości: [{img_array.min()}, {img_array.max()}]")
     
-    # (a) Skumulowany histogram
+    # (a) Skumulowany histogram (histogram liczony raz dla wszystkich kroków)
     hist_original = compute_histogram(img_array)
-    cdf_original = compute_cumulative_histogram(hist_original)
+    cdf_original = cumulative_histogram(img_array, hist=hist_original)
     
     # Zapisz oryginalny histogram
     plot_histogram(img_array, 'Histogram oryginalny - RezydencjaDiabla.png', 
-                   'histogram_original.png')
+                   'histogram_original.png', hist_original)
     
     # Zapisz skumulowany histogram
     plt.figure(figsize=(10, 4))
@@ -113,7 +95,7 @@ def main():
     
     # (b) Wyrównanie histogramu
     print("\n(b) Wyrównanie histogramu:")
-    img_equalized, mapping_equal = histogram_equalization(img_array)
+    img_equalized, mapping_equal = histogram_equalization(img_array, hist_original)
     
     # Raportuj wartości dla g = 40, 45, 50
     print(f"  H_equal(40) = {mapping_equal[40]}")
@@ -132,7 +114,7 @@ def main():
     # (c) Hiperbolizacja histogramu
     print("\n(c) Hiperbolizacja histogramu (α = -1/3):")
     alpha = -1/3
-    img_hyper, mapping_hyper = histogram_hyperbolization(img_array, alpha)
+    img_hyper, mapping_hyper = histogram_hyperbolization(img_array, alpha, hist_original)
     
     # Raportuj wartości dla g = 40, 45, 50
     print(f"  H_hyper(40) = {mapping_hyper[40]}")
@@ -5,10 +5,18 @@ Zadanie 9: Zwiększenie kontrastu poprzez zastosowanie kolorów (pseudokolorowan
 Zastosowanie trzech funkcji mapowania wartości szarości (R, G, B) do obrazu wyrównanego z zadania 7.
 """
 
+import os
+import sys
 import numpy as np
 from PIL import Image
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pixel_views import load_image
+from point_ops import (pseudocolor_lut, apply_lut, run_pipeline,
+                       equalization_step, pseudocolor_step)
+
 def create_blue_mapping():
     """
     Niebieski kanał:
@@ -83,22 +91,14 @@ def create_green_mapping():
     
     return mapping
 
-def apply_pseudocoloring(img_gray, r_map, g_map, b_map):
+def apply_pseudocoloring(img_gray, r_map, g_map, b_map, out=None):
     """
     Zastosuj pseudokolorowanie do obrazu w skali szarości.
-    Każda wartość szarości jest mapowana niezależnie na R, G, B.
+    Każda wartość szarości jest mapowana niezależnie na R, G, B
+    przez jedną LUT (256, 3) – jeden odczyt obrazu zamiast trzech.
     """
-    img_array = np.array(img_gray)
-    
-    # Utwórz trzy kanały RGB przez mapowanie wartości szarości
-    r_channel = r_map[img_array]
-    g_channel = g_map[img_array]
-    b_channel = b_map[img_array]
-    
-    # Złóż kanały w obraz RGB
-    img_rgb = np.stack([r_channel, g_channel, b_channel], axis=-1)
-    
-    return img_rgb
+    img_array = np.asarray(img_gray)
+    return apply_lut(img_array, pseudocolor_lut(r_map, g_map, b_map), out)
 
 def plot_mapping_functions(r_map, g_map, b_map, filename):
     """Wizualizuj funkcje mapowania RGB."""
@@ -122,12 +122,11 @@ def plot_mapping_functions(r_map, g_map, b_map, filename):
     print(f"Zapisano wykres funkcji mapowania: {filename}")
 
 def main():
-    # Wczytaj wyrównany obraz z zadania 7
-    img_path = '../zad7/RezydencjaDiabla_equalized.png'
-    img_gray = Image.open(img_path).convert('L')
-    img_array = np.array(img_gray)
+    # Wczytaj obraz oryginalny – wyrównanie z zadania 7 jest pierwszym krokiem potoku
+    img_path = '../RezydencjaDiabla.png'
+    img_array = load_image(img_path, 'L')
     
-    print(f"Wczytano obraz wyrównany: {img_array.shape}")
+    print(f"Wczytano obraz: {img_array.shape}")
     print(f"Zakres wartości: [{img_array.min()}, {img_array.max()}]")
     
     # Utwórz funkcje mapowania dla trzech kanałów
@@ -139,12 +138,15 @@ def main():
     # Wizualizuj funkcje mapowania
     plot_mapping_functions(r_mapping, g_mapping, b_mapping, 'mapping_functions.png')
     
-    # Zastosuj pseudokolorowanie
-    print("Stosowanie pseudokolorowania...")
-    img_colored = apply_pseudocoloring(img_gray, r_mapping, g_mapping, b_mapping)
+    # Wyrównanie histogramu (zad. 7) i pseudokolorowanie złożone w jedną LUT
+    print("Stosowanie wyrównania histogramu i pseudokolorowania (jedna LUT)...")
+    img_colored = run_pipeline(img_array, [
+        equalization_step(),
+        pseudocolor_step(r_mapping, g_mapping, b_mapping),
+    ])
     
     # Zapisz wynik
-    img_colored_pil = Image.fromarray(img_colored.astype(np.uint8))
+    img_colored_pil = Image.fromarray(img_colored)
     img_colored_pil.save('RezydencjaDiabla_pseudocolored.png')
     print("Zapisano obraz pseudokolorowany: RezydencjaDiabla_pseudocolored.png")
     
@@ -9,15 +9,18 @@ Skrypt:
 """
 
 import os
+import sys
 import numpy as np
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import pixel_views
+
 def get_script_dir():
     return os.path.dirname(os.path.abspath(__file__))
 
 def load_image(img_path):
-    img = Image.open(img_path).convert('L')
-    return np.array(img, dtype=np.float32)
+    return pixel_views.load_image(img_path, 'L', np.float32)
 
 def try_convolve2d():
     try:
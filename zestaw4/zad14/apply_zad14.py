@@ -13,11 +13,15 @@ Wyniki zapisane do: ../zad14_outputs/
 """
 
 import os
+import sys
 import numpy as np
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import pixel_views
+
 def load_image(path):
-    return np.array(Image.open(path).convert('L'), dtype=np.float32)
+    return pixel_views.load_image(path, 'L', np.float32)
 
 def save_uint8(arr, path):
     # rescale linearly for visualization
@@ -10,22 +10,27 @@ Skrypt:
 """
 
 import os
+import sys
 import numpy as np
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import pixel_views
+from normalize import percentiles, to_uint8
+
 def load_image(path):
-    return np.array(Image.open(path).convert('L'), dtype=np.float32)
+    return pixel_views.load_image(path, 'L', np.float32)
 
 def save_uint8(arr, path, clip_percent=0.0):
+    # optional clipping by percentiles to improve contrast (one np.partition for both)
     if clip_percent > 0:
-        lo = np.percentile(arr, clip_percent)
-        hi = np.percentile(arr, 100-clip_percent)
-        arr = np.clip(arr, lo, hi)
-    mn, mx = arr.min(), arr.max()
-    if mx - mn < 1e-8:
-        out = np.clip(arr, 0, 255).astype(np.uint8)
+        lo, hi = percentiles(arr, (clip_percent, 100-clip_percent))
+    else:
+        lo, hi = arr.min(), arr.max()
+    if hi - lo < 1e-8:
+        out = np.clip(np.clip(arr, lo, hi), 0, 255).astype(np.uint8)
     else:
-        out = ((arr - mn) / (mx - mn) * 255.0).astype(np.uint8)
+        out = to_uint8(arr, lo, hi)
     Image.fromarray(out).save(path)
 
 def convolve2d(im, k):
@@ -12,9 +12,13 @@ Użycie: python3 apply_zad24.py [--alpha 1.0]
 """
 import os
 import argparse
+import sys
 import numpy as np
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pixel_views import load_image
+
 
 def ensure_dir(p):
     if not os.path.exists(p):
@@ -84,8 +88,7 @@ def main():
     out_dir = base
     ensure_dir(out_dir)
 
-    img = Image.open(inp).convert('RGB')
-    arr = np.asarray(img).astype(np.float32)
+    arr = load_image(inp, 'RGB', np.float32)
     # Work on luminance (grayscale) for deconvolution
     g = to_gray(arr)
     # Normalize to 0..255 float (already)